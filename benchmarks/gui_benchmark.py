@@ -0,0 +1,183 @@
+"""Drive SmartTaskManager headlessly and time the widget-heavy paths.
+
+    python benchmarks/gui_benchmark.py
+    python benchmarks/gui_benchmark.py --sizes 100 1000 10000 --output gui.json
+
+Runs on the offscreen Qt platform, so no display is needed. For each task
+count it measures building the task list, typing a search (the GUI-thread
+cost of each keystroke and the time until its results are shown), and
+pomodoro ticks including the repaint, plus widget counts and RSS.
+"""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import json
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QEventLoop, QTimer
+from PyQt5.QtWidgets import QApplication
+
+import sweprojectfinal
+from sweprojectfinal import SmartTaskManager
+
+WORDS = ("report", "review", "meeting", "project", "budget", "plan", "email",
+         "design", "exercise", "study", "groceries", "presentation", "invoice")
+SEARCH_TEXT = "project review"
+
+
+def rss_mb():
+    """Current resident set size (Linux), falling back to the peak"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def fill_store(db, size, rng):
+    for task in list(db.get_tasks()):
+        db.delete_task(task[0])
+    for i in range(size):
+        status = rng.choice(("Pending", "Completed"))
+        due = f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        db.add_task((
+            " ".join(rng.sample(WORDS, 2)).capitalize(), due,
+            rng.choice(("High", "Medium", "Low")),
+            rng.choice(("Work", "Personal", "Study", "Health")),
+            status.lower(), status, " ".join(rng.choice(WORDS) for _ in range(6)), due, due
+        ))
+
+
+def wait_for(signal, timeout_ms=10000):
+    loop = QEventLoop()
+    signal.connect(loop.quit)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec_()
+    signal.disconnect(loop.quit)
+
+
+def drain_worker(window):
+    """Wait until everything queued on the database worker has been delivered"""
+    loop = QEventLoop()
+    window.db_worker.submit(lambda: None, callback=lambda result: loop.quit())
+    loop.exec_()
+
+
+def ms(seconds):
+    return seconds * 1000
+
+
+def run_size(app, size, ticks, seed):
+    rng = random.Random(seed)
+    window = SmartTaskManager()
+    window.show()
+    # Let the startup load finish so it can't land in the middle of a timing
+    drain_worker(window)
+    app.processEvents()
+    fill_store(window.db, size, rng)
+    results = {'rss_before_mb': rss_mb()}
+
+    # Task list: what load_tasks does once its read comes back, plus the
+    # first page of the virtual list (read on the worker), layout and paint
+    started = time.perf_counter()
+    window.show_task_list(window.read_task_list())
+    drain_worker(window)
+    app.processEvents()
+    results['build_list_ms'] = ms(time.perf_counter() - started)
+    results['task_cards'] = len(window.task_cards)
+    results['virtual_list'] = window.task_list_stack.currentWidget() is window.task_list_view
+    results['widgets'] = len(app.allWidgets())
+
+    # Search box: the GUI-thread cost of each keystroke (the search itself
+    # is debounced onto a worker), then the time from an immediate request
+    # for each prefix to its results being shown
+    keystrokes = []
+    for i in range(1, len(SEARCH_TEXT) + 1):
+        started = time.perf_counter()
+        window.search_input.setText(SEARCH_TEXT[:i])
+        app.processEvents()
+        keystrokes.append(time.perf_counter() - started)
+    wait_for(window.search_pipeline.results_ready)
+    results['keystroke_ms'] = ms(statistics.median(keystrokes))
+
+    selection = window.filter_combo.currentText()
+    searches = []
+    for i in range(1, len(SEARCH_TEXT) + 1):
+        started = time.perf_counter()
+        window.search_pipeline.request(SEARCH_TEXT[:i], selection, immediate=True)
+        wait_for(window.search_pipeline.results_ready)
+        app.processEvents()
+        searches.append(time.perf_counter() - started)
+    results['search_result_ms'] = ms(statistics.median(searches))
+    results['search_result_max_ms'] = ms(max(searches))
+    window.search_input.clear()
+    wait_for(window.search_pipeline.results_ready)
+
+    # Pomodoro ticks: a fake clock moves one second per tick, so every tick
+    # changes the display and is followed by its (partial) repaint
+    window.tabs.setCurrentWidget(window.pomodoro_tab)
+    app.processEvents()
+    now = [0.0]
+    window.pomodoro.clock = lambda: now[0]
+    window.start_pomodoro()
+    tick_times = []
+    for _ in range(ticks):
+        now[0] += 1.0
+        started = time.perf_counter()
+        window.update_timer()
+        app.processEvents()
+        tick_times.append(time.perf_counter() - started)
+    window.stop_pomodoro()
+    results['tick_ms'] = ms(statistics.median(tick_times))
+    results['tick_max_ms'] = ms(max(tick_times))
+
+    results['widgets_after'] = len(app.allWidgets())
+    results['rss_after_mb'] = rss_mb()
+
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int,
+                        default=[50, sweprojectfinal.VIRTUAL_LIST_THRESHOLD, 1000, 10000])
+    parser.add_argument("--ticks", type=int, default=60, help="pomodoro ticks to time")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    results = {}
+    for size in args.sizes:
+        print(f"GUI benchmark with {size} tasks...")
+        # Each size journals into its own disposable directory, so it starts
+        # from the demo tasks and never touches the user's data
+        with tempfile.TemporaryDirectory(prefix="gui_benchmark_") as data_dir:
+            sweprojectfinal.DATA_DIR = data_dir
+            results[str(size)] = run_size(app, size, args.ticks, args.seed)
+        for metric, value in results[str(size)].items():
+            print(f"  {metric:<24}{value:>12.2f}" if isinstance(value, float)
+                  else f"  {metric:<24}{value!s:>12}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({'platform': os.environ["QT_QPA_PLATFORM"], 'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
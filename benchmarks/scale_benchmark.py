@@ -0,0 +1,207 @@
+"""Time the in-memory task store at growing sizes and catch regressions.
+
+    python benchmarks/scale_benchmark.py                       # 1k, 10k, 100k
+    python benchmarks/scale_benchmark.py --sizes 1000 1000000 --output results.json
+    python benchmarks/scale_benchmark.py --baseline baseline.json --threshold 0.25
+
+For every size a store is filled with synthetic tasks (with tracemalloc
+on, to record its peak memory), then each operation the GUI relies on is
+timed: add, get_task_by_id, update, delete, every filter combo option,
+search and the dashboard aggregation. The store is then snapshotted to a
+temporary directory to time recovery from it and journaled adds. Timings
+are the median per call in microseconds. With --baseline, any metric more
+than --threshold slower (or bigger) than the saved run makes the script
+exit with status 1.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_journal import write_snapshot
+from task_store import DatabaseHandler
+
+PRIORITIES = ("High", "Medium", "Low")
+CATEGORIES = ("Work", "Personal", "Study", "Health", "Other")
+WORDS = ("report", "review", "meeting", "project", "budget", "plan", "email",
+         "design", "exercise", "study", "groceries", "presentation", "invoice")
+SEARCHES = ("rep", "project review", "groceries", "zzz")
+
+# Differences below this many microseconds are treated as noise
+NOISE_FLOOR_US = 2.0
+
+
+def filter_options(today):
+    # The task tab's filter combo, as mapped by SmartTaskManager.filter_query
+    return {
+        "all": {},
+        "pending": {"status": "Pending"},
+        "completed": {"status": "Completed"},
+        "high_priority": {"priority": "High"},
+        "medium_priority": {"priority": "Medium"},
+        "low_priority": {"priority": "Low"},
+        "overdue": {"status": "Pending", "due_before": today},
+        "due_today": {"due_on": today},
+    }
+
+
+def synthetic_task(rng, today):
+    due = (today + timedelta(days=rng.randint(-60, 60))).strftime("%Y-%m-%d")
+    status = rng.choice(("Pending", "Pending", "Completed"))
+    return (
+        " ".join(rng.sample(WORDS, 2)).capitalize(), due, rng.choice(PRIORITIES),
+        rng.choice(CATEGORIES), status.lower(), status,
+        " ".join(rng.choice(WORDS) for _ in range(8)), due, due
+    )
+
+
+def build_store(size, rng, today):
+    db = DatabaseHandler()
+    for _ in range(size):
+        db.add_task(synthetic_task(rng, today))
+    return db
+
+
+def median_us(func, args_list, warm_up=True):
+    # One untimed warm-up call, and no GC pauses inside the timings (as timeit)
+    if warm_up:
+        func(*args_list[0])
+    timings = []
+    gc.disable()
+    try:
+        for args in args_list:
+            started = time.perf_counter()
+            func(*args)
+            timings.append(time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return statistics.median(timings) * 1e6
+
+
+def run_size(size, samples, seed):
+    rng = random.Random(seed)
+    today = date.today()
+    results = {}
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    db = build_store(size, rng, today)
+    results['build_s'] = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results['memory_mb'] = current / 2 ** 20
+    results['memory_peak_mb'] = peak / 2 ** 20
+
+    ids = [task[0] for task in db.get_tasks()]
+    new_tasks = [(synthetic_task(rng, today),) for _ in range(samples)]
+    first_new_id = db.next_id
+    results['add_us'] = median_us(db.add_task, new_tasks)
+    added = list(range(first_new_id, db.next_id))
+
+    results['get_task_by_id_us'] = median_us(
+        db.get_task_by_id, [(rng.choice(ids),) for _ in range(samples)])
+    results['update_us'] = median_us(
+        db.update_task, [(rng.choice(ids), synthetic_task(rng, today)) for _ in range(samples)])
+    results['delete_us'] = median_us(db.delete_task, [(task_id,) for task_id in added],
+                                     warm_up=False)
+
+    # Filters and search return whole result sets, so fewer samples
+    query_samples = [()] * max(5, samples // 10)
+    for name, query in filter_options(today.strftime("%Y-%m-%d")).items():
+        if query:
+            results[f'filter_{name}_us'] = median_us(lambda: db.query_tasks(**query), query_samples)
+        else:
+            results[f'filter_{name}_us'] = median_us(db.get_tasks, query_samples)
+    for text in SEARCHES:
+        key = text.replace(" ", "_")
+        results[f'search_{key}_us'] = median_us(lambda: db.query_tasks(search=text), query_samples)
+    results['dashboard_us'] = median_us(db.get_stats, [()] * samples)
+    results.update(time_persistence(db, samples, rng, today))
+    return results
+
+
+def time_persistence(db, samples, rng, today):
+    """Recovery time of a snapshot of db, and add_task with journaling on"""
+    results = {}
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_snapshot(data_dir, db.next_id, db.get_all_settings(),
+                       [tuple(task) for task in db.get_tasks()])
+        started = time.perf_counter()
+        recovered = DatabaseHandler(data_dir=data_dir)
+        results['recover_s'] = time.perf_counter() - started
+        new_tasks = [(synthetic_task(rng, today),) for _ in range(samples)]
+        results['journal_add_us'] = median_us(recovered.add_task, new_tasks)
+        recovered.close()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return a list of (size, metric, baseline, current) regressions"""
+    regressions = []
+    for size, metrics in results.items():
+        previous = baseline.get(size)
+        if previous is None:
+            continue
+        for metric, value in metrics.items():
+            old = previous.get(metric)
+            if old is None or metric == 'build_s':
+                continue
+            # Timings need to clear the noise floor as well as the ratio
+            if metric.endswith('_us') and value - old < NOISE_FLOOR_US:
+                continue
+            if value > old * (1 + threshold):
+                regressions.append((size, metric, old, value))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000, 100000])
+    parser.add_argument("--samples", type=int, default=500, help="calls timed per operation")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown as a fraction (default 0.25)")
+    args = parser.parse_args()
+
+    results = {}
+    for size in args.sizes:
+        print(f"Benchmarking {size} tasks...")
+        results[str(size)] = run_size(size, args.samples, args.seed)
+        for metric, value in results[str(size)].items():
+            print(f"  {metric:<28}{value:>14.2f}")
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'samples': args.samples,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for size, metric, old, new in regressions:
+            print(f"REGRESSION {size} tasks {metric}: {old:.2f} -> {new:.2f}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions above {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Run one task workload against every storage backend and compare them.
+
+    python benchmarks/storage_benchmark.py --tasks 5000 --ops 5000
+    python benchmarks/storage_benchmark.py --backends memory sqlite --json results.json
+    python benchmarks/storage_benchmark.py --backends mysql --mysql-user me --mysql-password pw
+
+Each backend is seeded with the same synthetic tasks, then runs the same
+random mix of CRUD, filter, search and stats calls. The report lists
+ops/sec and p50/p99 latency per operation. Before timing, each backend's
+search results are checked against the shared word-prefix rule, so the
+search timings compare the same work.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import tokenize
+from storage import MemoryStorage, MySQLStorage, SQLiteStorage, matches_search
+
+PRIORITIES = ("High", "Medium", "Low")
+STATUSES = ("Pending", "Completed")
+CATEGORIES = ("Work", "Personal", "Study", "Health")
+WORDS = ("report", "review", "meeting", "project", "budget", "plan", "email",
+         "design", "exercise", "study", "groceries", "presentation", "invoice")
+
+# Relative weight of each operation in the mixed workload
+OPERATION_MIX = {
+    'get': 30,
+    'update': 20,
+    'add': 10,
+    'delete': 10,
+    'filter': 15,
+    'search': 10,
+    'stats': 5,
+}
+
+
+def random_task(rng):
+    title = " ".join(rng.sample(WORDS, 2)).capitalize()
+    description = " ".join(rng.choice(WORDS) for _ in range(6))
+    due_date = f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+    return (title, description, due_date, rng.choice(PRIORITIES),
+            rng.choice(STATUSES), rng.choice(CATEGORIES))
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[int(round(fraction * (len(sorted_values) - 1)))]
+
+
+def check_search(storage):
+    """Raise AssertionError if storage.search() disagrees with
+    matches_search() on the tasks it holds"""
+    rows = storage.list_tasks()
+    queries = {word[:4] for word in WORDS} | {"", " ", "proj rev", "?!"}
+    for query in sorted(queries):
+        words = tokenize(query)
+        if not query.strip():
+            expected = rows
+        else:
+            expected = [row for row in rows if words and matches_search(words, row)]
+        found = storage.search(query)
+        if [row.id for row in found] != [row.id for row in expected]:
+            raise AssertionError(f"{storage.name}: search({query!r}) returned {len(found)} "
+                                 f"tasks, expected {len(expected)}")
+
+
+def run_workload(storage, tasks=1000, ops=2000, seed=42):
+    """Seed `tasks` tasks, then run `ops` mixed operations.
+
+    Returns {operation: [latency in seconds, ...]} including the seeding
+    inserts under 'seed'.
+    """
+    rng = random.Random(seed)
+    latencies = {name: [] for name in ('seed',) + tuple(OPERATION_MIX)}
+    ids = []
+    for _ in range(tasks):
+        fields = random_task(rng)
+        started = time.perf_counter()
+        task_id = storage.add(*fields)
+        latencies['seed'].append(time.perf_counter() - started)
+        ids.append(task_id)
+    check_search(storage)
+
+    names = list(OPERATION_MIX)
+    weights = [OPERATION_MIX[name] for name in names]
+    for name in rng.choices(names, weights, k=ops):
+        if name in ('get', 'update', 'delete') and not ids:
+            name = 'add'
+        if name == 'get':
+            args = (rng.choice(ids),)
+        elif name == 'update':
+            args = (rng.choice(ids),) + random_task(rng)
+        elif name == 'add':
+            args = random_task(rng)
+        elif name == 'delete':
+            args = (ids.pop(rng.randrange(len(ids))),)
+        elif name == 'filter':
+            args = (rng.choice(STATUSES + (None,)), rng.choice(PRIORITIES + (None,)),
+                    rng.choice(CATEGORIES + (None,)))
+        elif name == 'search':
+            args = (rng.choice(WORDS)[:4],)
+        else:
+            args = ()
+        call = getattr(storage, name)
+
+        started = time.perf_counter()
+        result = call(*args)
+        latencies[name].append(time.perf_counter() - started)
+        if name == 'add':
+            ids.append(result)
+    return latencies
+
+
+def summarize(latencies):
+    """Per-operation count, ops/sec, p50 and p99 (milliseconds)"""
+    summary = {}
+    for name, values in latencies.items():
+        if not values:
+            continue
+        values = sorted(values)
+        total = sum(values)
+        summary[name] = {
+            'count': len(values),
+            'ops_per_sec': len(values) / total if total else float('inf'),
+            'p50_ms': percentile(values, 0.50) * 1000,
+            'p99_ms': percentile(values, 0.99) * 1000,
+        }
+    mixed = [value for name, values in latencies.items() if name != 'seed' for value in values]
+    if mixed:
+        summary['mixed'] = {
+            'count': len(mixed),
+            'ops_per_sec': len(mixed) / sum(mixed),
+            'p50_ms': percentile(sorted(mixed), 0.50) * 1000,
+            'p99_ms': percentile(sorted(mixed), 0.99) * 1000,
+        }
+    return summary
+
+
+def print_report(backend, summary):
+    print(f"\n{backend}")
+    print(f"  {'operation':<10}{'count':>8}{'ops/sec':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, row in summary.items():
+        print(f"  {name:<10}{row['count']:>8}{row['ops_per_sec']:>12.0f}"
+              f"{row['p50_ms']:>10.3f}{row['p99_ms']:>10.3f}")
+
+
+def open_backends(args, workdir):
+    for name in args.backends:
+        if name == "memory":
+            yield MemoryStorage()
+        elif name == "sqlite":
+            yield SQLiteStorage(database=os.path.join(workdir, "benchmark.db"))
+        elif name == "mysql":
+            yield MySQLStorage(host=args.mysql_host, user=args.mysql_user,
+                               password=args.mysql_password, database=args.mysql_database,
+                               pool_size=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["memory", "sqlite"],
+                        choices=["memory", "sqlite", "mysql"])
+    parser.add_argument("--tasks", type=int, default=1000, help="tasks to seed")
+    parser.add_argument("--ops", type=int, default=2000, help="mixed operations to run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--mysql-host", default="localhost")
+    parser.add_argument("--mysql-user", default="root")
+    parser.add_argument("--mysql-password", default="")
+    parser.add_argument("--mysql-database", default="task_manager_benchmark")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for storage in open_backends(args, workdir):
+            try:
+                latencies = run_workload(storage, args.tasks, args.ops, args.seed)
+            finally:
+                storage.close()
+            results[storage.name] = summarize(latencies)
+            print_report(storage.name, results[storage.name])
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({'tasks': args.tasks, 'ops': args.ops, 'seed': args.seed,
+                       'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
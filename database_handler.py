@@ -1,18 +1,132 @@
+import queue
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector.errors import PoolError
 from datetime import datetime
 
+import metrics
+
+# Fixed-size pool of MySQL connections with checkout/return semantics
+class ConnectionPool:
+    def __init__(self, size, **connect_args):
+        self.size = size
+        self.connect_args = connect_args
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+    
+    def acquire(self, timeout=None):
+        """Check out a live connection, blocking while all of them are in use"""
+        if not self._slots.acquire(timeout=timeout):
+            raise PoolError(msg=f"No free connection after {timeout}s")
+        try:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                connection = None
+            return self._ensure_alive(connection)
+        except Exception:
+            self._slots.release()
+            raise
+    
+    def release(self, connection):
+        try:
+            if connection.is_connected():
+                # Never hand an open transaction to the next caller
+                connection.rollback()
+                self._idle.put(connection)
+        except Error:
+            pass
+        finally:
+            self._slots.release()
+    
+    def close(self):
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                connection.close()
+            except Error:
+                pass
+    
+    def _ensure_alive(self, connection):
+        if connection is not None:
+            try:
+                # Liveness check; reconnects a dropped connection in place
+                connection.ping(reconnect=True, attempts=2, delay=0)
+                return connection
+            except Error:
+                pass
+        return mysql.connector.connect(**self.connect_args)
+
+def _chunks(rows, chunk_size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
 class DatabaseHandler:
-    def __init__(self, host, user, password, database):
+    ADD_TASK_QUERY = """
+        INSERT INTO Tasks 
+        (title, description, due_date, due_time, priority, status, category, recurrence, attachment_path)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """
+    UPDATE_TASK_QUERY = """
+        UPDATE Tasks 
+        SET title=%s, description=%s, due_date=%s, due_time=%s, priority=%s,
+            status=%s, category=%s, recurrence=%s, attachment_path=%s
+        WHERE id=%s
+    """
+
+    def __init__(self, host, user, password, database, pool_size=None, pool_timeout=None,
+                 stats_ttl=None, prepared_statements=False, statement_cache_size=32):
         self.host = host
         self.user = user
         self.password = password
         self.database = database
+        # With pool_size set, every query checks out its own connection and
+        # the handler can be shared by worker threads; otherwise a single
+        # connection is used, one query at a time
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        self.pool = None
         self.connection = None
+        self._lock = threading.RLock()
+        # get_task_stats cache: dropped by every task mutation made through
+        # this handler and, if stats_ttl is set, after that many seconds
+        # (to pick up changes made by other clients)
+        self.stats_ttl = stats_ttl
+        self._stats_cache = None
+        self._stats_generation = 0
+        # Server-side prepared statements for parameterized queries, cached
+        # per connection (LRU, keyed by SQL text)
+        self.prepared_statements = prepared_statements
+        self.statement_cache_size = statement_cache_size
         self.connect()
 
     def connect(self):
         try:
+            if self.pool_size:
+                self.pool = ConnectionPool(
+                    self.pool_size,
+                    host=self.host,
+                    user=self.user,
+                    password=self.password,
+                    database=self.database
+                )
+                # Open one connection up front so bad credentials show early
+                self.pool.release(self.pool.acquire(self.pool_timeout))
+                print(f"Connected to MySQL database (pool of {self.pool_size})")
+                return
             self.connection = mysql.connector.connect(
                 host=self.host,
                 user=self.user,
@@ -25,29 +139,148 @@ class DatabaseHandler:
             print(f"Error connecting to MySQL: {e}")
 
     def disconnect(self):
+        if self.pool is not None:
+            self.pool.close()
+            print("MySQL connection pool closed")
         if self.connection and self.connection.is_connected():
             self.connection.close()
             print("MySQL connection closed")
 
-    def execute_query(self, query, params=None, fetch=False):
-        cursor = None
+    @contextmanager
+    def checkout(self):
+        """Yield a live connection for the duration of the with block.
+
+        Pooled connections go back to the pool afterwards; the single
+        connection is reconnected if it dropped and held under a lock.
+        """
+        if self.pool is not None:
+            connection = self.pool.acquire(self.pool_timeout)
+            try:
+                yield connection
+            finally:
+                self.pool.release(connection)
+            return
+        with self._lock:
+            if self.connection is None:
+                self.connection = mysql.connector.connect(
+                    host=self.host,
+                    user=self.user,
+                    password=self.password,
+                    database=self.database
+                )
+            else:
+                self.connection.ping(reconnect=True, attempts=2, delay=0)
+            yield self.connection
+
+    def execute_query(self, query, params=None, fetch=False, rowcount=False):
+        """Run one statement; returns the rows when fetch is set, otherwise
+        commits and returns the cursor's lastrowid, or its rowcount when
+        rowcount is set. Thread-safe."""
+        started = time.perf_counter()
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(query, params or ())
-            if fetch:
-                return cursor.fetchall()
-            self.connection.commit()
+            with self.checkout() as connection:
+                if self.prepared_statements and params:
+                    return self._execute_prepared(connection, query, params, fetch, rowcount)
+                cursor = connection.cursor()
+                try:
+                    cursor.execute(query, params or ())
+                    if fetch:
+                        return cursor.fetchall()
+                    connection.commit()
+                    return cursor.rowcount if rowcount else cursor.lastrowid
+                finally:
+                    cursor.close()
         except Error as e:
             print(f"MySQL error: {e}")
             return None
         finally:
-            if cursor:
+            if metrics.REGISTRY.enabled:
+                metrics.REGISTRY.observe_query(query, time.perf_counter() - started, "mysql")
+
+    def _execute_prepared(self, connection, query, params, fetch, rowcount=False):
+        # The cache lives on the connection and is tagged with the server
+        # connection id, so statements prepared before a reconnect are
+        # dropped instead of reused
+        cache = getattr(connection, "_statement_cache", None)
+        if cache is None or cache[0] != connection.connection_id:
+            cache = (connection.connection_id, OrderedDict())
+            connection._statement_cache = cache
+        statements = cache[1]
+
+        entry = statements.get(query)
+        if entry is None:
+            entry = (query, connection.cursor(prepared=True))
+            statements[query] = entry
+            if len(statements) > self.statement_cache_size:
+                _, (_, evicted) = statements.popitem(last=False)
+                try:
+                    evicted.close()
+                except Error:
+                    pass
+        else:
+            statements.move_to_end(query)
+
+        # Execute with the cached string object: the prepared cursor only
+        # skips re-preparing when it sees the same statement again
+        sql, cursor = entry
+        try:
+            cursor.execute(sql, params)
+            if fetch:
+                return cursor.fetchall()
+            connection.commit()
+            return cursor.rowcount if rowcount else cursor.lastrowid
+        except Error:
+            statements.pop(query, None)
+            try:
                 cursor.close()
+            except Error:
+                pass
+            raise
+
+    def execute_many(self, query, rows, chunk_size=1000):
+        """Run query for every row with executemany, one transaction per
+        chunk of rows. rows may be any iterable, including a generator.
+
+        Returns the number of affected rows, or None on error; chunks
+        committed before the failing one are kept, the failing one is
+        rolled back.
+        """
+        total = 0
+        try:
+            with self.checkout() as connection:
+                cursor = connection.cursor()
+                try:
+                    for chunk in _chunks(rows, chunk_size):
+                        try:
+                            cursor.executemany(query, chunk)
+                            connection.commit()
+                        except Error:
+                            connection.rollback()
+                            raise
+                        total += cursor.rowcount
+                finally:
+                    cursor.close()
+        except Error as e:
+            print(f"MySQL error after {total} rows: {e}")
+            return None
+        return total
 
     # --- Task Operations ---
+    # Secondary indexes on Tasks: the filter/search columns, the composite
+    # used by "pending and due before" queries, and FULLTEXT for search
+    TASK_INDEXES = {
+        'idx_tasks_status': "INDEX idx_tasks_status (status)",
+        'idx_tasks_priority': "INDEX idx_tasks_priority (priority)",
+        'idx_tasks_due_date': "INDEX idx_tasks_due_date (due_date)",
+        'idx_tasks_category': "INDEX idx_tasks_category (category)",
+        'idx_tasks_status_due_date': "INDEX idx_tasks_status_due_date (status, due_date)",
+        'ft_tasks_title_description': "FULLTEXT INDEX ft_tasks_title_description (title, description)"
+    }
+
     def create_tables(self):
+        index_definitions = ",\n                ".join(self.TASK_INDEXES.values())
         queries = [
-            """
+            f"""
             CREATE TABLE IF NOT EXISTS Tasks (
                 id INT AUTO_INCREMENT PRIMARY KEY,
                 title VARCHAR(255) NOT NULL,
@@ -58,8 +291,9 @@ class DatabaseHandler:
                 status ENUM('Pending', 'Completed') DEFAULT 'Pending',
                 category VARCHAR(100),
                 recurrence ENUM('None', 'Daily', 'Weekly', 'Monthly') DEFAULT 'None',
-                attachment_path TEXT
-            )
+                attachment_path TEXT,
+                {index_definitions}
+            ) ENGINE=InnoDB
             """,
             """
             CREATE TABLE IF NOT EXISTS TaskHistory (
@@ -79,27 +313,61 @@ class DatabaseHandler:
         ]
         for query in queries:
             self.execute_query(query)
+        self.migrate_indexes()
 
-    def add_task(self, task_data):
-        query = """
-            INSERT INTO Tasks 
-            (title, description, due_date, due_time, priority, status, category, recurrence, attachment_path)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    def migrate_indexes(self):
+        """Add any of TASK_INDEXES missing from an existing Tasks table.
+
+        CREATE TABLE IF NOT EXISTS leaves tables created by older versions
+        untouched, so their indexes are added in place here. Returns the
+        names of the indexes that were added.
         """
-        self.execute_query(query, task_data)
-        return self.connection.lastrowid
+        rows = self.execute_query(
+            """
+            SELECT DISTINCT index_name FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = 'Tasks'
+            """,
+            fetch=True
+        )
+        if rows is None:
+            return []
+        existing = {row[0] for row in rows}
+        added = []
+        for name, definition in self.TASK_INDEXES.items():
+            if name not in existing:
+                # execute_query returns None on error
+                if self.execute_query(f"ALTER TABLE Tasks ADD {definition}") is not None:
+                    added.append(name)
+        if added:
+            print(f"Added indexes to Tasks: {', '.join(added)}")
+        return added
+
+    def add_task(self, task_data):
+        task_id = self.execute_query(self.ADD_TASK_QUERY, task_data)
+        self.invalidate_stats()
+        return task_id
+
+    def add_tasks(self, tasks, chunk_size=1000):
+        """Bulk insert task_data tuples; executemany turns each chunk into
+        a single multi-row INSERT. Returns the number of rows inserted."""
+        count = self.execute_many(self.ADD_TASK_QUERY, tasks, chunk_size)
+        self.invalidate_stats()
+        return count
 
     def update_task(self, task_id, task_data):
-        query = """
-            UPDATE Tasks 
-            SET title=%s, description=%s, due_date=%s, due_time=%s, priority=%s,
-                status=%s, category=%s, recurrence=%s, attachment_path=%s
-            WHERE id=%s
-        """
-        self.execute_query(query, (*task_data, task_id))
+        self.execute_query(self.UPDATE_TASK_QUERY, (*task_data, task_id))
+        self.invalidate_stats()
+
+    def update_tasks(self, updates, chunk_size=1000):
+        """Bulk update from (task_id, task_data) pairs in chunked transactions"""
+        rows = ((*task_data, task_id) for task_id, task_data in updates)
+        count = self.execute_many(self.UPDATE_TASK_QUERY, rows, chunk_size)
+        self.invalidate_stats()
+        return count
 
     def delete_task(self, task_id):
         self.execute_query("DELETE FROM Tasks WHERE id=%s", (task_id,))
+        self.invalidate_stats()
 
     def get_tasks(self, filter_condition=None):
         base_query = "SELECT id, title, due_date, priority, status, category FROM Tasks"
@@ -107,20 +375,103 @@ class DatabaseHandler:
             base_query += f" WHERE {filter_condition}"
         return self.execute_query(base_query, fetch=True)
 
+    def get_tasks_page(self, page_size=100, after=None):
+        """Keyset page of tasks ordered by (due_date, id).
+
+        after is the last row of the previous page (None for the first
+        page). Seeking past it uses idx_tasks_due_date (which ends in the
+        primary key), so every page costs the same as the first one.
+        Tasks without a due date sort first, as in ORDER BY due_date.
+        """
+        base_query = "SELECT id, title, due_date, priority, status, category FROM Tasks"
+        if after is None:
+            return self.execute_query(
+                f"{base_query} ORDER BY due_date, id LIMIT %s", (page_size,), fetch=True
+            )
+        task_id, due_date = after[0], after[2]
+        if due_date is None:
+            condition = "(due_date IS NULL AND id > %s) OR due_date IS NOT NULL"
+            params = (task_id, page_size)
+        else:
+            condition = "due_date > %s OR (due_date = %s AND id > %s)"
+            params = (due_date, due_date, task_id, page_size)
+        return self.execute_query(
+            f"{base_query} WHERE {condition} ORDER BY due_date, id LIMIT %s", params, fetch=True
+        )
+
+    def iter_tasks(self, batch_size=1000):
+        """Stream every task in id order, batch_size rows at a time, so
+        memory stays flat however large Tasks is.
+
+        Each batch is a keyset query on the primary key that checks out the
+        connection only while it runs: nothing is held between batches, so
+        other threads (and the caller) can query while iterating.
+        """
+        query = ("SELECT id, title, due_date, priority, status, category FROM Tasks "
+                 "WHERE id > %s ORDER BY id LIMIT %s")
+        last_id = 0
+        while True:
+            rows = self.execute_query(query, (last_id, batch_size), fetch=True)
+            if not rows:
+                return
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1][0]
+
     # --- Dashboard Stats ---
     def get_task_stats(self):
+        cached = self._stats_cache
+        if cached is not None:
+            stats, cached_at = cached
+            if self.stats_ttl is None or time.monotonic() - cached_at < self.stats_ttl:
+                return stats
+
+        # One pass over Tasks with conditional aggregation instead of two
+        # COUNTs and two GROUP BYs
+        generation = self._stats_generation
+        rows = self.execute_query(
+            """
+            SELECT COUNT(*),
+                   SUM(status = 'Completed'), SUM(status = 'Pending'),
+                   SUM(priority = 'High'), SUM(priority = 'Medium'), SUM(priority = 'Low')
+            FROM Tasks
+            """,
+            fetch=True
+        )
+        if not rows:
+            return {
+                'total_tasks': 0,
+                'completed_tasks': 0,
+                'priority_distribution': [],
+                'status_distribution': []
+            }
+        total, completed, pending, high, medium, low = (int(value or 0) for value in rows[0])
         stats = {
-            'total_tasks': self.execute_query("SELECT COUNT(*) FROM Tasks", fetch=True)[0][0],
-            'completed_tasks': self.execute_query("SELECT COUNT(*) FROM Tasks WHERE status='Completed'", fetch=True)[0][0],
-            'priority_distribution': self.execute_query(
-                "SELECT priority, COUNT(*) FROM Tasks GROUP BY priority", fetch=True
-            ),
-            'status_distribution': self.execute_query(
-                "SELECT status, COUNT(*) FROM Tasks GROUP BY status", fetch=True
-            )
+            'total_tasks': total,
+            'completed_tasks': completed,
+            'priority_distribution': [
+                (priority, count)
+                for priority, count in (('High', high), ('Medium', medium), ('Low', low))
+                if count
+            ],
+            'status_distribution': [
+                (status, count)
+                for status, count in (('Pending', pending), ('Completed', completed))
+                if count
+            ]
         }
+        # Skip caching if a mutation landed while the query was running
+        if generation == self._stats_generation:
+            self._stats_cache = (stats, time.monotonic())
         return stats
 
+    def invalidate_stats(self):
+        # Called after a write, so a stats query that overlapped the write
+        # sees the generation change and is not cached
+        self._stats_generation += 1
+        self._stats_cache = None
+
     # --- Settings ---
     def save_setting(self, name, value):
         query = """
@@ -135,4 +486,23 @@ class DatabaseHandler:
             "SELECT setting_value FROM UserSettings WHERE setting_name=%s",
             (name,), fetch=True
         )
-        return result[0][0] if result else None
\ No newline at end of file
+        return result[0][0] if result else None
+
+    def get_all_settings(self):
+        """Every UserSettings row as a dict in one query; None on error"""
+        rows = self.execute_query(
+            "SELECT setting_name, setting_value FROM UserSettings", fetch=True
+        )
+        return dict(rows) if rows is not None else None
+
+    def save_settings(self, settings):
+        """Upsert a {name: value} dict as one multi-row statement"""
+        # VALUES(col) is deprecated since MySQL 8.0.20 but still supported;
+        # the row-alias form that replaces it is a syntax error on MariaDB
+        # and MySQL before 8.0.19
+        query = """
+            INSERT INTO UserSettings (setting_name, setting_value)
+            VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE setting_value=VALUES(setting_value)
+        """
+        return self.execute_many(query, settings.items()) is not None
\ No newline at end of file
@@ -0,0 +1,194 @@
+import functools
+import json
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+
+# Histogram bucket upper bounds in seconds (Prometheus "le" values); the
+# last, implicit bucket is +Inf
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_VERBS = {"SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "CREATE", "ALTER", "DROP"}
+_TABLE_RE = re.compile(
+    r"\b(?:FROM|INTO|UPDATE|TABLE(?:\s+IF\s+NOT\s+EXISTS)?|ON)\s+`?(\w+)", re.IGNORECASE
+)
+
+
+def statement_tag(query):
+    """Short label for a SQL statement, e.g. "SELECT Tasks" """
+    words = query.split(None, 1)
+    verb = words[0].upper() if words else ""
+    if verb not in _VERBS:
+        return "OTHER"
+    match = _TABLE_RE.search(query)
+    return f"{verb} {match.group(1)}" if match else verb
+
+
+class Histogram:
+    """Fixed buckets plus count, sum and max; constant size however many
+    observations it gets"""
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, fraction):
+        """Upper bound of the bucket holding the given quantile"""
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(bound, self.max)
+        return self.max
+
+
+# In-process metrics registry
+class MetricsRegistry:
+    """Latency histograms keyed by metric name and labels.
+
+    Memory is bounded: each metric keeps at most max_series label sets
+    (later ones are folded into an "other" series), the statement tag cache
+    is capped, and only the last slow_query_log_size slow queries are kept.
+    Queries slower than slow_query_threshold seconds are also printed.
+    """
+    def __init__(self, max_series=200, slow_query_threshold=0.2, slow_query_log_size=100):
+        self.enabled = True
+        self.max_series = max_series
+        self.slow_query_threshold = slow_query_threshold
+        self.slow_queries = deque(maxlen=slow_query_log_size)
+        self._series = {}
+        # (backend, SQL text) -> its histogram, so timing a query costs two
+        # dict lookups rather than tagging the SQL again
+        self._query_histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name, labels=()):
+        """The histogram for a metric and label set, created on first use"""
+        with self._lock:
+            series = self._series.setdefault(name, {})
+            histogram = series.get(labels)
+            if histogram is None:
+                if len(series) >= self.max_series:
+                    labels = (("series", "other"),)
+                    histogram = series.get(labels)
+                if histogram is None:
+                    histogram = series[labels] = Histogram()
+            return histogram
+
+    def observe(self, name, seconds, labels=()):
+        """Record one duration; labels is a tuple of (key, value) pairs"""
+        histogram = self.histogram(name, labels)
+        with self._lock:
+            histogram.observe(seconds)
+
+    def observe_query(self, query, seconds, backend="mysql"):
+        key = (backend, query)
+        histogram = self._query_histograms.get(key)
+        if histogram is None:
+            if len(self._query_histograms) >= 1024:
+                self._query_histograms.clear()
+            labels = (("backend", backend), ("statement", statement_tag(query)))
+            histogram = self._query_histograms[key] = self.histogram("query_duration_seconds", labels)
+        with self._lock:
+            histogram.observe(seconds)
+        if self.slow_query_threshold is not None and seconds >= self.slow_query_threshold:
+            statement = " ".join(query.split())
+            self.slow_queries.append({'statement': statement, 'seconds': seconds,
+                                      'at': time.time()})
+            print(f"Slow query ({seconds * 1000:.1f} ms): {statement[:200]}")
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+            self._query_histograms.clear()
+            self.slow_queries.clear()
+
+    # --- Export ---
+    def to_dict(self):
+        with self._lock:
+            metrics = {}
+            for name, series in self._series.items():
+                metrics[name] = [
+                    {
+                        'labels': dict(labels),
+                        'count': histogram.count,
+                        'sum': histogram.total,
+                        'max': histogram.max,
+                        'p50': histogram.quantile(0.5),
+                        'p99': histogram.quantile(0.99),
+                        'buckets': dict(zip([str(bound) for bound in BUCKETS] + ["+Inf"],
+                                            histogram.counts)),
+                    }
+                    for labels, histogram in series.items()
+                ]
+            return {'metrics': metrics, 'slow_queries': list(self.slow_queries)}
+
+    def to_prometheus(self):
+        """Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._series.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for labels, histogram in series.items():
+                    label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+                    prefix = f"{label_text}," if label_text else ""
+                    cumulative = 0
+                    for bound, count in zip(BUCKETS, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {histogram.count}')
+                    suffix = f"{{{label_text}}}" if label_text else ""
+                    lines.append(f"{name}_sum{suffix} {histogram.total}")
+                    lines.append(f"{name}_count{suffix} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Write a .prom file in Prometheus format, anything else as JSON.
+        The file is replaced atomically so scrapers never see half of it."""
+        if path.endswith(".prom"):
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.to_dict(), indent=2)
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as f:
+            f.write(content)
+        os.replace(temporary, path)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REGISTRY = MetricsRegistry()
+
+
+def timed(name, **labels):
+    """Decorator recording each call's duration in REGISTRY"""
+    label_items = tuple(sorted(labels.items()))
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not REGISTRY.enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                REGISTRY.observe(name, time.perf_counter() - started, label_items)
+        return wrapper
+    return decorate
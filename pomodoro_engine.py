@@ -0,0 +1,98 @@
+import math
+import time
+
+# Tick cadence in milliseconds: while the timer is on screen it wakes up
+# when the displayed second changes, otherwise only every HIDDEN_INTERVAL
+# (or at the end of the session, whichever comes first)
+HIDDEN_INTERVAL = 30000
+TICK_SLACK = 5
+
+
+# Pomodoro countdown, independent of Qt
+class PomodoroEngine:
+    """Work/break session countdown computed from a deadline.
+
+    The remaining time always comes from the monotonic clock instead of
+    being decremented per tick, so a late tick (modal dialog, slow reload)
+    or several missed ones are caught up in one step and never cause
+    drift. The owner calls tick() whenever next_interval() says so.
+    """
+    def __init__(self, work_seconds, break_seconds, clock=time.monotonic):
+        self.clock = clock
+        self.work_seconds = work_seconds
+        self.break_seconds = break_seconds
+        self.is_work_session = True
+        self.duration = work_seconds
+        self.visible = True
+        self._remaining = work_seconds
+        self._deadline = None
+
+    @property
+    def running(self):
+        return self._deadline is not None
+
+    def remaining(self):
+        """Seconds left in the current session (float)"""
+        if self._deadline is None:
+            return self._remaining
+        return max(0.0, self._deadline - self.clock())
+
+    def remaining_seconds(self):
+        """Whole seconds left, rounded up the way a countdown displays them"""
+        return int(math.ceil(self.remaining()))
+
+    def elapsed(self):
+        return self.duration - self.remaining()
+
+    def start(self):
+        if self._deadline is None and self._remaining > 0:
+            self._deadline = self.clock() + self._remaining
+
+    def pause(self):
+        if self._deadline is not None:
+            self._remaining = self.remaining()
+            self._deadline = None
+
+    def stop(self):
+        """Back to the start of a work session"""
+        self._deadline = None
+        self.is_work_session = True
+        self.duration = self.work_seconds
+        self._remaining = self.duration
+
+    def set_durations(self, work_seconds, break_seconds):
+        """Apply new session lengths; time already spent in the current
+        session is kept, and a session that is now over ends on the next tick"""
+        self.work_seconds = work_seconds
+        self.break_seconds = break_seconds
+        new_duration = work_seconds if self.is_work_session else break_seconds
+        elapsed = self.elapsed()
+        remaining = max(0.0, new_duration - elapsed)
+        self.duration = new_duration
+        if self._deadline is None:
+            self._remaining = remaining
+        else:
+            self._deadline = self.clock() + remaining
+
+    def tick(self):
+        """Check the clock; returns "work" or "break" when that session just
+        ended (the next one is then set up but not started), otherwise None"""
+        if self.remaining() > 0:
+            return None
+        finished = "work" if self.is_work_session else "break"
+        self.is_work_session = not self.is_work_session
+        self.duration = self.work_seconds if self.is_work_session else self.break_seconds
+        self._remaining = self.duration
+        self._deadline = None
+        return finished
+
+    def next_interval(self):
+        """Milliseconds until the next tick is useful, or None when stopped"""
+        if self._deadline is None:
+            return None
+        remaining_ms = self.remaining() * 1000
+        if not self.visible:
+            return int(min(HIDDEN_INTERVAL, remaining_ms)) + TICK_SLACK
+        # Wake up just after the displayed second changes
+        until_next_second = remaining_ms % 1000 or 1000
+        return int(until_next_second) + TICK_SLACK
@@ -0,0 +1,127 @@
+import re
+import sys
+from array import array
+from bisect import bisect_left, insort
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def _tokens(fields):
+    tokens = set()
+    for field in fields:
+        tokens.update(tokenize(field))
+    return tokens
+
+
+# Inverted index over task text fields (title, description, category)
+class SearchIndex:
+    """Token -> task id postings plus a sorted vocabulary for prefix lookups.
+
+    Every word of a query has to match the start of some word in the task,
+    so "proj rev" finds "Project review" but "view" does not (matching is
+    by word prefix, not by substring). The index is updated one task at a
+    time, which keeps new and edited tasks searchable immediately.
+
+    Postings are sorted arrays of 64-bit ids rather than sets: about 8
+    bytes per entry instead of ~40, and since new tasks get the highest id
+    adding one is an append. Results come back in ascending id order.
+    """
+    def __init__(self, keep_tokens=True):
+        """With keep_tokens=False the index stores nothing per document.
+        That is for owners that still have a document's fields when it
+        changes: they pass them to remove(), and remove a document before
+        adding it again."""
+        self._postings = {}
+        self._vocabulary = []
+        self._doc_tokens = {} if keep_tokens else None
+        self._count = 0
+    
+    def __len__(self):
+        return self._count
+    
+    def add(self, doc_id, *fields):
+        if self._doc_tokens is not None:
+            if doc_id in self._doc_tokens:
+                self.remove(doc_id)
+            # Only needed to find the postings again on remove, so kept as
+            # a tuple of interned strings rather than a set per document
+            tokens = self._doc_tokens[doc_id] = tuple(map(sys.intern, _tokens(fields)))
+        else:
+            tokens = _tokens(fields)
+        self._count += 1
+        for token in tokens:
+            ids = self._postings.get(token)
+            if ids is None:
+                self._postings[sys.intern(token)] = array("q", (doc_id,))
+                insort(self._vocabulary, token)
+            elif ids[-1] < doc_id:
+                ids.append(doc_id)
+            else:
+                insort(ids, doc_id)
+    
+    def update(self, doc_id, *fields):
+        self.add(doc_id, *fields)
+    
+    def remove(self, doc_id, *fields):
+        """Drop a document; fields are its indexed text when keep_tokens is off"""
+        if self._doc_tokens is not None:
+            if doc_id not in self._doc_tokens:
+                return
+            tokens = self._doc_tokens.pop(doc_id)
+        else:
+            tokens = _tokens(fields)
+        self._count -= 1
+        for token in tokens:
+            ids = self._postings.get(token)
+            if ids is None:
+                continue
+            i = bisect_left(ids, doc_id)
+            if i < len(ids) and ids[i] == doc_id:
+                del ids[i]
+            if not ids:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+    
+    def search(self, query, cancelled=None):
+        """Return the ids matching every word of query, in ascending order.
+
+        Returns None for a blank query, meaning "no restriction"; a query
+        with no words in it (only punctuation) matches nothing. The result
+        may be one of the index's own postings, so callers must not modify
+        it. cancelled is an optional callable polled before each word; once
+        it returns True the lookup stops and returns [], so callers that
+        pass it must check it again themselves.
+        """
+        words = set(tokenize(query))
+        if not words:
+            return None if not query or query.isspace() else []
+        # Resolve the longest (most selective) words first so the
+        # intersection shrinks as early as possible
+        result = None
+        for word in sorted(words, key=len, reverse=True):
+            if cancelled is not None and cancelled():
+                return []
+            matches = self._prefix_postings(word)
+            if result is not None:
+                # Filtering the larger list by the smaller keeps id order
+                small, large = sorted((result, matches), key=len)
+                matches = list(filter(set(small).__contains__, large))
+            result = matches
+            if not result:
+                return []
+        return result
+    
+    def _prefix_postings(self, prefix):
+        vocabulary = self._vocabulary
+        start = i = bisect_left(vocabulary, prefix)
+        end = len(vocabulary)
+        while i < end and vocabulary[i].startswith(prefix):
+            i += 1
+        if i - start == 1:
+            # A single matching word: hand out its postings without copying
+            return self._postings[vocabulary[start]]
+        return sorted(set().union(*(self._postings[token] for token in vocabulary[start:i])))
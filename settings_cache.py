@@ -0,0 +1,104 @@
+import threading
+
+
+# Write-behind cache in front of a handler's UserSettings
+class SettingsCache:
+    """In-memory copy of every setting, loaded with one query.
+
+    Reads come from memory, parsed once per value. Writes update memory
+    immediately and are handed to the handler's save_settings() together
+    once no change has arrived for `delay` seconds, so dragging a spinbox
+    costs one database write instead of one per step.
+
+    The delayed write starts on a threading.Timer thread. It calls the
+    handler from that thread unless submit is given: submit(flush) then
+    hands the flush to the owner's own database thread (the GUI passes its
+    DatabaseWorker). flush() and close() write on the calling thread.
+    """
+    def __init__(self, db, defaults=None, delay=0.5, submit=None):
+        self.db = db
+        self.delay = delay
+        self._submit = submit
+        self._defaults = {name: str(value) for name, value in (defaults or {}).items()}
+        self._values = dict(self._defaults)
+        self._typed = {}
+        self._dirty = {}
+        self._timer = None
+        self._lock = threading.Lock()
+        # Flushes run one at a time so an older batch never lands last
+        self._flush_lock = threading.Lock()
+
+    def load(self):
+        """Replace the cached values with what is stored; unsaved changes win"""
+        stored = self.db.get_all_settings()
+        if stored is None:
+            print("Settings load error: using defaults")
+            return False
+        with self._lock:
+            self._values = dict(self._defaults)
+            self._values.update(stored)
+            self._values.update(self._dirty)
+            self._typed.clear()
+        return True
+
+    def get(self, name, default=None):
+        return self._values.get(name, default)
+
+    def get_int(self, name, default=0):
+        key = (name, int)
+        value = self._typed.get(key)
+        if value is None:
+            try:
+                value = int(self._values[name])
+            except (KeyError, TypeError, ValueError):
+                return default
+            self._typed[key] = value
+        return value
+
+    def set(self, name, value):
+        """Returns False when the value did not change (nothing is written)"""
+        value = str(value)
+        with self._lock:
+            if self._values.get(name) == value:
+                return False
+            self._values[name] = value
+            self._typed.pop((name, int), None)
+            self._dirty[name] = value
+            # Every change restarts the quiet period
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self._flush_later)
+            self._timer.daemon = True
+            self._timer.start()
+        return True
+
+    def _flush_later(self):
+        if self._submit is None:
+            self.flush()
+        else:
+            self._submit(self.flush)
+
+    def flush(self):
+        """Write pending changes now; returns False if the write failed"""
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                pending, self._dirty = self._dirty, {}
+            if not pending:
+                return True
+            try:
+                saved = self.db.save_settings(pending)
+            except Exception as e:
+                print(f"Settings save error: {e}")
+                saved = False
+            if not saved:
+                # Keep them for the next flush, unless they changed again since
+                with self._lock:
+                    for name, value in pending.items():
+                        self._dirty.setdefault(name, value)
+            return saved
+
+    def close(self):
+        return self.flush()
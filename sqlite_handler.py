@@ -0,0 +1,362 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+import metrics
+
+# Connection pragmas: WAL lets readers run alongside the writer, NORMAL
+# only fsyncs at checkpoints (a power loss can drop the last commits but
+# never corrupts the file), and mmap serves reads straight from the page
+# cache
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+def _chunks(rows, chunk_size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Embedded single-file backend with the same methods as the MySQL handler
+class DatabaseHandler:
+    """Tasks, TaskHistory and UserSettings in a local SQLite file.
+
+    Queries use SQLite's ? placeholders. Writes are committed in batches:
+    a transaction is committed once commit_batch_size statements are
+    pending or commit_interval seconds after its first write, whichever
+    comes first (commit_interval=0 commits every write). commit() and
+    disconnect() flush immediately.
+    """
+    ADD_TASK_QUERY = """
+        INSERT INTO Tasks
+        (title, description, due_date, due_time, priority, status, category, recurrence, attachment_path)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    UPDATE_TASK_QUERY = """
+        UPDATE Tasks
+        SET title=?, description=?, due_date=?, due_time=?, priority=?,
+            status=?, category=?, recurrence=?, attachment_path=?
+        WHERE id=?
+    """
+
+    def __init__(self, database="task_manager.db", commit_batch_size=100, commit_interval=0.2,
+                 stats_ttl=None):
+        self.database = database
+        self.commit_batch_size = commit_batch_size
+        self.commit_interval = commit_interval
+        self.connection = None
+        self._lock = threading.RLock()
+        self._pending_writes = 0
+        self._commit_timer = None
+        self.stats_ttl = stats_ttl
+        self._stats_cache = None
+        self._stats_generation = 0
+        self.connect()
+
+    def connect(self):
+        try:
+            # The handler serializes access itself, so the connection may
+            # be used from worker threads
+            self.connection = sqlite3.connect(self.database, check_same_thread=False)
+            for pragma in PRAGMAS:
+                self.connection.execute(pragma)
+            print(f"Connected to SQLite database {self.database}")
+        except sqlite3.Error as e:
+            print(f"Error opening SQLite database: {e}")
+
+    def disconnect(self):
+        if self.connection is not None:
+            self.commit()
+            with self._lock:
+                self.connection.close()
+                self.connection = None
+            print("SQLite connection closed")
+
+    @contextmanager
+    def checkout(self):
+        """Yield the connection, held under the handler's lock"""
+        with self._lock:
+            if self.connection is None:
+                self.connect()
+            yield self.connection
+
+    def commit(self):
+        """Commit pending writes now"""
+        with self._lock:
+            if self._commit_timer is not None:
+                self._commit_timer.cancel()
+                self._commit_timer = None
+            if self.connection is not None and self.connection.in_transaction:
+                try:
+                    self.connection.commit()
+                except sqlite3.Error as e:
+                    # Still pending: the next write or commit() retries
+                    print(f"SQLite commit error: {e}")
+                    return
+            self._pending_writes = 0
+
+    def _wrote(self, count=1):
+        # Called with the lock held after a successful write
+        self._pending_writes += count
+        if self._pending_writes >= self.commit_batch_size or not self.commit_interval:
+            self.commit()
+        elif self._commit_timer is None:
+            self._commit_timer = threading.Timer(self.commit_interval, self.commit)
+            self._commit_timer.daemon = True
+            self._commit_timer.start()
+
+    def execute_query(self, query, params=None, fetch=False, rowcount=False):
+        """Run one statement; returns the rows when fetch is set, otherwise
+        returns the cursor's lastrowid, or its rowcount when rowcount is set
+        (the commit may be batched)."""
+        started = time.perf_counter()
+        try:
+            with self.checkout() as connection:
+                cursor = connection.execute(query, params or ())
+                if fetch:
+                    return cursor.fetchall()
+                self._wrote()
+                return cursor.rowcount if rowcount else cursor.lastrowid
+        except sqlite3.Error as e:
+            # Only the failed statement is undone; batched writes stay
+            print(f"SQLite error: {e}")
+            return None
+        finally:
+            if metrics.REGISTRY.enabled:
+                metrics.REGISTRY.observe_query(query, time.perf_counter() - started, "sqlite")
+
+    def execute_many(self, query, rows, chunk_size=1000):
+        """Run query for every row, one transaction per chunk. Returns the
+        number of affected rows, or None on error; chunks committed before
+        the failing one are kept, the failing one is rolled back."""
+        total = 0
+        try:
+            with self.checkout() as connection:
+                # Flush batched writes first so that rolling back a failed
+                # chunk undoes nothing but that chunk
+                self.commit()
+                for chunk in _chunks(rows, chunk_size):
+                    try:
+                        cursor = connection.executemany(query, chunk)
+                        connection.commit()
+                    except sqlite3.Error:
+                        connection.rollback()
+                        raise
+                    total += cursor.rowcount
+        except sqlite3.Error as e:
+            print(f"SQLite error after {total} rows: {e}")
+            return None
+        return total
+
+    # --- Task Operations ---
+    # Secondary indexes on Tasks, as in the MySQL schema, plus the
+    # TaskHistory foreign key. There is no FULLTEXT equivalent; text search
+    # goes through the in-process SearchIndex
+    TASK_INDEXES = {
+        'idx_tasks_status': "CREATE INDEX IF NOT EXISTS idx_tasks_status ON Tasks (status)",
+        'idx_tasks_priority': "CREATE INDEX IF NOT EXISTS idx_tasks_priority ON Tasks (priority)",
+        'idx_tasks_due_date': "CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON Tasks (due_date)",
+        'idx_tasks_category': "CREATE INDEX IF NOT EXISTS idx_tasks_category ON Tasks (category)",
+        'idx_tasks_status_due_date':
+            "CREATE INDEX IF NOT EXISTS idx_tasks_status_due_date ON Tasks (status, due_date)",
+        'idx_task_history_task_id':
+            "CREATE INDEX IF NOT EXISTS idx_task_history_task_id ON TaskHistory (task_id)"
+    }
+
+    def create_tables(self):
+        # INTEGER PRIMARY KEY makes id the rowid, so lookups by id need no
+        # separate index
+        queries = [
+            """
+            CREATE TABLE IF NOT EXISTS Tasks (
+                id INTEGER PRIMARY KEY,
+                title TEXT NOT NULL,
+                description TEXT,
+                due_date TEXT,
+                due_time TEXT,
+                priority TEXT NOT NULL CHECK (priority IN ('High', 'Medium', 'Low')),
+                status TEXT DEFAULT 'Pending' CHECK (status IN ('Pending', 'Completed')),
+                category TEXT,
+                recurrence TEXT DEFAULT 'None'
+                    CHECK (recurrence IN ('None', 'Daily', 'Weekly', 'Monthly')),
+                attachment_path TEXT
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS TaskHistory (
+                id INTEGER PRIMARY KEY,
+                task_id INTEGER REFERENCES Tasks(id) ON DELETE CASCADE,
+                completion_date TEXT
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS UserSettings (
+                id INTEGER PRIMARY KEY,
+                setting_name TEXT UNIQUE,
+                setting_value TEXT
+            )
+            """
+        ]
+        # IF NOT EXISTS also adds indexes missing from older files
+        for query in queries + list(self.TASK_INDEXES.values()):
+            self.execute_query(query)
+        self.commit()
+
+    def add_task(self, task_data):
+        task_id = self.execute_query(self.ADD_TASK_QUERY, task_data)
+        self.invalidate_stats()
+        return task_id
+
+    def add_tasks(self, tasks, chunk_size=1000):
+        """Bulk insert task_data tuples in chunked transactions. Returns the
+        number of rows inserted."""
+        count = self.execute_many(self.ADD_TASK_QUERY, tasks, chunk_size)
+        self.invalidate_stats()
+        return count
+
+    def update_task(self, task_id, task_data):
+        self.execute_query(self.UPDATE_TASK_QUERY, (*task_data, task_id))
+        self.invalidate_stats()
+
+    def update_tasks(self, updates, chunk_size=1000):
+        """Bulk update from (task_id, task_data) pairs in chunked transactions"""
+        rows = ((*task_data, task_id) for task_id, task_data in updates)
+        count = self.execute_many(self.UPDATE_TASK_QUERY, rows, chunk_size)
+        self.invalidate_stats()
+        return count
+
+    def delete_task(self, task_id):
+        self.execute_query("DELETE FROM Tasks WHERE id=?", (task_id,))
+        self.invalidate_stats()
+
+    def get_tasks(self, filter_condition=None):
+        base_query = "SELECT id, title, due_date, priority, status, category FROM Tasks"
+        if filter_condition:
+            base_query += f" WHERE {filter_condition}"
+        return self.execute_query(base_query, fetch=True)
+
+    def get_tasks_page(self, page_size=100, after=None):
+        """Keyset page of tasks ordered by (due_date, id); see the MySQL
+        handler. NULL due dates sort first in SQLite too."""
+        base_query = "SELECT id, title, due_date, priority, status, category FROM Tasks"
+        if after is None:
+            return self.execute_query(
+                f"{base_query} ORDER BY due_date, id LIMIT ?", (page_size,), fetch=True
+            )
+        task_id, due_date = after[0], after[2]
+        if due_date is None:
+            condition = "(due_date IS NULL AND id > ?) OR due_date IS NOT NULL"
+            params = (task_id, page_size)
+        else:
+            condition = "due_date > ? OR (due_date = ? AND id > ?)"
+            params = (due_date, due_date, task_id, page_size)
+        return self.execute_query(
+            f"{base_query} WHERE {condition} ORDER BY due_date, id LIMIT ?", params, fetch=True
+        )
+
+    def iter_tasks(self, batch_size=1000):
+        """Stream every task in id order, batch_size rows at a time; see the
+        MySQL handler. The lock is only held while a batch is read."""
+        query = ("SELECT id, title, due_date, priority, status, category FROM Tasks "
+                 "WHERE id > ? ORDER BY id LIMIT ?")
+        last_id = 0
+        while True:
+            rows = self.execute_query(query, (last_id, batch_size), fetch=True)
+            if not rows:
+                return
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1][0]
+
+    # --- Dashboard Stats ---
+    def get_task_stats(self):
+        cached = self._stats_cache
+        if cached is not None:
+            stats, cached_at = cached
+            if self.stats_ttl is None or time.monotonic() - cached_at < self.stats_ttl:
+                return stats
+
+        generation = self._stats_generation
+        rows = self.execute_query(
+            """
+            SELECT COUNT(*),
+                   SUM(status = 'Completed'), SUM(status = 'Pending'),
+                   SUM(priority = 'High'), SUM(priority = 'Medium'), SUM(priority = 'Low')
+            FROM Tasks
+            """,
+            fetch=True
+        )
+        if not rows:
+            return {
+                'total_tasks': 0,
+                'completed_tasks': 0,
+                'priority_distribution': [],
+                'status_distribution': []
+            }
+        total, completed, pending, high, medium, low = (int(value or 0) for value in rows[0])
+        stats = {
+            'total_tasks': total,
+            'completed_tasks': completed,
+            'priority_distribution': [
+                (priority, count)
+                for priority, count in (('High', high), ('Medium', medium), ('Low', low))
+                if count
+            ],
+            'status_distribution': [
+                (status, count)
+                for status, count in (('Pending', pending), ('Completed', completed))
+                if count
+            ]
+        }
+        if generation == self._stats_generation:
+            self._stats_cache = (stats, time.monotonic())
+        return stats
+
+    def invalidate_stats(self):
+        self._stats_generation += 1
+        self._stats_cache = None
+
+    # --- Settings ---
+    def save_setting(self, name, value):
+        query = """
+            INSERT INTO UserSettings (setting_name, setting_value)
+            VALUES (?, ?)
+            ON CONFLICT(setting_name) DO UPDATE SET setting_value=excluded.setting_value
+        """
+        self.execute_query(query, (name, value))
+
+    def get_setting(self, name):
+        result = self.execute_query(
+            "SELECT setting_value FROM UserSettings WHERE setting_name=?",
+            (name,), fetch=True
+        )
+        return result[0][0] if result else None
+
+    def get_all_settings(self):
+        """Every UserSettings row as a dict in one query; None on error"""
+        rows = self.execute_query(
+            "SELECT setting_name, setting_value FROM UserSettings", fetch=True
+        )
+        return dict(rows) if rows is not None else None
+
+    def save_settings(self, settings):
+        """Upsert a {name: value} dict in one transaction"""
+        query = """
+            INSERT INTO UserSettings (setting_name, setting_value)
+            VALUES (?, ?)
+            ON CONFLICT(setting_name) DO UPDATE SET setting_value=excluded.setting_value
+        """
+        return self.execute_many(query, settings.items()) is not None
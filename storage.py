@@ -0,0 +1,253 @@
+from abc import ABC, abstractmethod
+from collections import namedtuple
+
+from search_index import tokenize
+
+# Normalized task row shared by every backend: the columns the in-memory
+# store and the SQL schema have in common
+TaskRow = namedtuple(
+    "TaskRow",
+    ("id", "title", "description", "due_date", "priority", "status", "category")
+)
+
+TASK_ROW_COLUMNS = "id, title, description, due_date, priority, status, category"
+
+
+def _date_text(value):
+    # MySQL hands back datetime.date, the other backends 'yyyy-MM-dd' text
+    if value is None or isinstance(value, str):
+        return value or None
+    return value.strftime("%Y-%m-%d")
+
+
+def matches_search(words, row):
+    """True if every word starts some word of the row's title, description
+    or category (the in-memory search index's rule)"""
+    row_words = set(tokenize(row.title))
+    row_words.update(tokenize(row.description))
+    row_words.update(tokenize(row.category))
+    return all(any(w.startswith(word) for w in row_words) for word in words)
+
+
+# Storage protocol
+class TaskStorage(ABC):
+    """The operations every backend adapter provides.
+
+    Rows come back as TaskRow; writes take the same fields (without the id).
+    add() returns the new id, update() and delete() return True/False (False
+    for a missing id), and stats() returns {'total', 'by_status',
+    'by_priority'}. search() matches words by prefix (see matches_search)
+    and returns every task for a blank query, in id order on all backends.
+    """
+    name = "storage"
+
+    @abstractmethod
+    def add(self, title, description, due_date, priority, status, category):
+        pass
+
+    @abstractmethod
+    def get(self, task_id):
+        pass
+
+    @abstractmethod
+    def update(self, task_id, title, description, due_date, priority, status, category):
+        pass
+
+    @abstractmethod
+    def delete(self, task_id):
+        pass
+
+    @abstractmethod
+    def list_tasks(self):
+        pass
+
+    @abstractmethod
+    def filter(self, status=None, priority=None, category=None):
+        pass
+
+    @abstractmethod
+    def search(self, text):
+        pass
+
+    @abstractmethod
+    def stats(self):
+        pass
+
+    def close(self):
+        pass
+
+
+# --- In-memory store (task_store) ---
+class MemoryStorage(TaskStorage):
+    name = "memory"
+
+    def __init__(self, store=None):
+        if store is None:
+            from task_store import DatabaseHandler
+            # Empty, like a new SQL database
+            store = DatabaseHandler(demo_tasks=False)
+        self.store = store
+
+    @staticmethod
+    def _row(task):
+        if task is None:
+            return None
+        return TaskRow(task.id, task.title, task.description, task.due_date or None,
+                       task.priority, task.status, task.category)
+
+    @staticmethod
+    def _data(title, description, due_date, priority, status, category, old=None):
+        # Fields outside TaskRow keep their old values on update
+        start_date = old.start_date if old is not None else ""
+        end_date = old.end_date if old is not None else due_date or ""
+        return (title, due_date or "", priority, category, status.lower(), status,
+                description, start_date, end_date)
+
+    def add(self, title, description, due_date, priority, status, category):
+        return self.store.add_task(self._data(title, description, due_date, priority,
+                                              status, category)) or None
+
+    def get(self, task_id):
+        return self._row(self.store.get_task_by_id(task_id))
+
+    def update(self, task_id, title, description, due_date, priority, status, category):
+        old = self.store.get_task_by_id(task_id)
+        if old is None:
+            return False
+        return self.store.update_task(task_id, self._data(title, description, due_date,
+                                                          priority, status, category, old))
+
+    def delete(self, task_id):
+        return self.store.delete_task(task_id)
+
+    def list_tasks(self):
+        return [self._row(task) for task in self.store.get_tasks()]
+
+    def filter(self, status=None, priority=None, category=None):
+        return [self._row(task) for task in
+                self.store.query_tasks(status=status, priority=priority, category=category)]
+
+    def search(self, text):
+        return [self._row(task) for task in self.store.search_tasks(text)]
+
+    def stats(self):
+        stats = self.store.get_stats()
+        return {'total': stats['total'], 'by_status': stats['by_status'],
+                'by_priority': stats['by_priority']}
+
+    def close(self):
+        self.store.close()
+
+
+# --- SQL handlers (database_handler / sqlite_handler) ---
+class SQLStorage(TaskStorage):
+    """Adapter over a handler with execute_query() and the Tasks schema.
+
+    Subclasses set the placeholder style; columns outside TaskRow keep their
+    schema defaults on insert and their values on update.
+    """
+    PARAM = "?"
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.handler.create_tables()
+
+    def _sql(self, query):
+        return query.replace("?", self.PARAM)
+
+    def _rows(self, query, params=()):
+        rows = self.handler.execute_query(self._sql(query), params, fetch=True) or []
+        return [TaskRow(row[0], row[1], row[2], _date_text(row[3]), row[4], row[5], row[6])
+                for row in rows]
+
+    def add(self, title, description, due_date, priority, status, category):
+        task_id = self.handler.execute_query(self._sql(
+            "INSERT INTO Tasks (title, description, due_date, priority, status, category) "
+            "VALUES (?, ?, ?, ?, ?, ?)"
+        ), (title, description, due_date or None, priority, status, category))
+        self.handler.invalidate_stats()
+        return task_id
+
+    def get(self, task_id):
+        rows = self._rows(f"SELECT {TASK_ROW_COLUMNS} FROM Tasks WHERE id = ?", (task_id,))
+        return rows[0] if rows else None
+
+    def update(self, task_id, title, description, due_date, priority, status, category):
+        count = self.handler.execute_query(self._sql(
+            "UPDATE Tasks SET title = ?, description = ?, due_date = ?, priority = ?, "
+            "status = ?, category = ? WHERE id = ?"
+        ), (title, description, due_date or None, priority, status, category, task_id),
+            rowcount=True)
+        self.handler.invalidate_stats()
+        if count == 0:
+            # MySQL counts changed rows, not matched ones: an update that
+            # leaves the row as it was reports 0 too
+            return self.get(task_id) is not None
+        return bool(count)
+
+    def delete(self, task_id):
+        count = self.handler.execute_query(self._sql("DELETE FROM Tasks WHERE id = ?"),
+                                           (task_id,), rowcount=True)
+        self.handler.invalidate_stats()
+        return bool(count)
+
+    def list_tasks(self):
+        return self._rows(f"SELECT {TASK_ROW_COLUMNS} FROM Tasks ORDER BY id")
+
+    def filter(self, status=None, priority=None, category=None):
+        conditions, params = [], []
+        for column, value in (("status", status), ("priority", priority), ("category", category)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self._rows(f"SELECT {TASK_ROW_COLUMNS} FROM Tasks{where} ORDER BY id", params)
+
+    def search(self, text):
+        # LIKE narrows the table down to rows containing every word; the
+        # word-prefix rule is then checked on those, so results match the
+        # in-memory store's
+        if not text or not text.strip():
+            return self.list_tasks()
+        words = tokenize(text)
+        if not words:
+            return []
+        conditions, params = [], []
+        for word in words:
+            pattern = "%" + word.replace("!", "!!").replace("%", "!%").replace("_", "!_") + "%"
+            conditions.append("(title LIKE ? ESCAPE '!' OR description LIKE ? ESCAPE '!' "
+                              "OR category LIKE ? ESCAPE '!')")
+            params += (pattern, pattern, pattern)
+        rows = self._rows(f"SELECT {TASK_ROW_COLUMNS} FROM Tasks "
+                          f"WHERE {' AND '.join(conditions)} ORDER BY id", params)
+        return [row for row in rows if matches_search(words, row)]
+
+    def stats(self):
+        stats = self.handler.get_task_stats()
+        return {'total': stats['total_tasks'],
+                'by_status': dict(stats['status_distribution']),
+                'by_priority': dict(stats['priority_distribution'])}
+
+    def close(self):
+        self.handler.disconnect()
+
+
+class SQLiteStorage(SQLStorage):
+    name = "sqlite"
+
+    def __init__(self, handler=None, database="task_manager.db"):
+        if handler is None:
+            from sqlite_handler import DatabaseHandler
+            handler = DatabaseHandler(database)
+        super().__init__(handler)
+
+
+class MySQLStorage(SQLStorage):
+    name = "mysql"
+    PARAM = "%s"
+
+    def __init__(self, handler=None, **connect_args):
+        if handler is None:
+            from database_handler import DatabaseHandler
+            handler = DatabaseHandler(**connect_args)
+        super().__init__(handler)
@@ -1,6 +1,10 @@
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+import os
 import sys
-import mysql.connector
-from mysql.connector import Error
+import threading
+from collections import deque
 from datetime import datetime, timedelta
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QPushButton, QTableWidget, QTableWidgetItem, 
@@ -8,88 +12,87 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QH
                              QProgressBar, QTextEdit, QFileDialog, QMessageBox, QCheckBox,
                              QSpinBox, QDialog, QFormLayout, QGroupBox, QStackedWidget,
                              QFrame, QSizePolicy, QGraphicsDropShadowEffect, QSlider,
-                             QScrollArea)
-from PyQt5.QtCore import Qt, QDate, QTime, QTimer, QPropertyAnimation, QEasingCurve, pyqtProperty, QRect
-from PyQt5.QtGui import QIcon, QFont, QColor, QPalette, QPainter, QPen, QBrush, QLinearGradient
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+                             QScrollArea, QListView, QStyledItemDelegate, QStyle)
+from PyQt5.QtCore import (Qt, QDate, QTime, QTimer, QPropertyAnimation, QEasingCurve, pyqtProperty, QRect,
+                          QAbstractListModel, QModelIndex, QEvent, QSize, pyqtSignal,
+                          QObject, QRunnable, QThreadPool)
+from PyQt5.QtGui import (QIcon, QFont, QFontMetrics, QColor, QPalette, QPainter, QPen, QBrush, QLinearGradient,
+                         QPixmap, QRegion)
 import math
+import metrics
+from pomodoro_engine import PomodoroEngine
+from settings_cache import SettingsCache
+from task_store import DatabaseHandler
 
-# Enhanced Database Handler with working CRUD operations
-class DatabaseHandler:
-    def __init__(self, host=None, user=None, password=None, database=None):
-        # Using in-memory storage for demo purposes
-        self.tasks = [
-            [1, "Complete project proposal", "2024-02-15", "High", "Work", "pending", "Pending", "Important project deadline", "2024-02-10", "2024-02-15"],
-            [2, "Review code changes", "2024-02-12", "Medium", "Development", "pending", "Pending", "Code review for new features", "2024-02-11", "2024-02-12"],
-            [3, "Team meeting", "2024-02-13", "High", "Meeting", "completed", "Completed", "Weekly team sync", "2024-02-13", "2024-02-13"],
-            [4, "Update documentation", "2024-02-14", "Low", "Documentation", "pending", "Pending", "Update user manual", "2024-02-14", "2024-02-14"],
-            [5, "Prepare presentation", "2024-02-16", "High", "Work", "pending", "Pending", "Quarterly review presentation", "2024-02-15", "2024-02-16"],
-        ]
-        self.next_id = 6
-        self.settings = {
-            'work_duration': '25',
-            'break_duration': '5',
-            'long_break_duration': '15'
-        }
-    
-    def connect(self):
-        return True
-    
-    def create_tables(self):
-        return True
-    
-    def get_tasks(self, condition=None, params=None):
-        return [tuple(task) for task in self.tasks]
-    
-    def get_task_by_id(self, task_id):
-        for task in self.tasks:
-            if task[0] == task_id:
-                return tuple(task)
-        return None
-    
-    def add_task(self, task_data):
-        try:
-            new_task = [self.next_id] + list(task_data)
-            self.tasks.append(new_task)
-            self.next_id += 1
-            return True
-        except Exception as e:
-            print(f"Error adding task: {e}")
-            return False
-    
-    def update_task(self, task_id, task_data):
-        try:
-            for i, task in enumerate(self.tasks):
-                if task[0] == task_id:
-                    # Keep the ID and update the rest
-                    self.tasks[i] = [task_id] + list(task_data)
-                    return True
-            return False
-        except Exception as e:
-            print(f"Error updating task: {e}")
-            return False
-    
-    def delete_task(self, task_id):
-        try:
-            for i, task in enumerate(self.tasks):
-                if task[0] == task_id:
-                    del self.tasks[i]
-                    return True
-            return False
-        except Exception as e:
-            print(f"Error deleting task: {e}")
-            return False
+_IMPORT_FINISHED = time.perf_counter()
+
+# Above this many tasks the list switches from TaskCard widgets to the
+# virtualized task list view, which only paints the rows on screen and pulls
+# tasks from the store a page at a time as the user scrolls
+VIRTUAL_LIST_THRESHOLD = 200
+TASK_PAGE_SIZE = 100
+TASK_ROLE = Qt.UserRole
+
+
+def due_order(task):
+    """Sort key of the task list, cards and pages alike: the store's
+    get_tasks_page order (no due date first, then by due date and id)"""
+    return (task.due_date or "", task.id)
+
+def list_pages(tasks):
+    """fetch_page(page_size, after) over tasks already sorted by due_order,
+    so a large search result is paged into the list like the store is"""
+    def fetch_page(page_size, after=None):
+        start = 0
+        if after is not None:
+            key, hi = due_order(after), len(tasks)
+            while start < hi:
+                mid = (start + hi) // 2
+                if due_order(tasks[mid]) <= key:
+                    start = mid + 1
+                else:
+                    hi = mid
+        return tasks[start:start + page_size]
+    return fetch_page
+
+SETTINGS_DEFAULTS = {
+    'work_duration': 25,
+    'break_duration': 5,
+    'long_break_duration': 15,
+}
+
+# Tasks are journaled here and recovered on the next start
+DATA_DIR = os.environ.get("TASK_MANAGER_DATA",
+                          os.path.join(os.path.expanduser("~"), ".smart_task_manager"))
+
+# --- Startup Timing ---
+class StartupTimer:
+    """Cold-start milestones, in milliseconds since this module started importing"""
+    def __init__(self):
+        self.marks = {'import': (_IMPORT_FINISHED - _IMPORT_STARTED) * 1000}
+        self.reported = False
     
-    def get_setting(self, setting_name):
-        return self.settings.get(setting_name, '25')
+    def mark(self, name):
+        # Only the first occurrence of a milestone counts
+        self.marks.setdefault(name, (time.perf_counter() - _IMPORT_STARTED) * 1000)
     
-    def update_setting(self, setting_name, value):
-        self.settings[setting_name] = value
-        return True
+    def report(self):
+        """Print the timings once both first paint and the task list are done"""
+        if self.reported or 'first_paint' not in self.marks or 'interactive' not in self.marks:
+            return
+        self.reported = True
+        print(f"Startup: import {self.marks['import']:.0f} ms, "
+              f"window built {self.marks.get('window', 0):.0f} ms, "
+              f"first paint {self.marks['first_paint']:.0f} ms, "
+              f"interactive {self.marks['interactive']:.0f} ms")
 
 # Custom Circular Progress Widget
 class CircularProgress(QWidget):
+    # Pre-rendered background rings, shared by every instance and keyed by
+    # (size, device pixel ratio, color) so a DPI change renders a new one
+    _ring_cache = {}
+    RING_WIDTH = 10
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setFixedSize(350, 350)  # Increased size
@@ -99,49 +102,112 @@ class CircularProgress(QWidget):
         self._color = QColor(234, 67, 53)  # Red for work
         self._background_color = QColor(240, 240, 240)
         self._text_color = QColor(60, 60, 60)
-        
+        # Painting state is built once and only replaced when it changes
+        self._font = QFont("Arial", 32, QFont.Bold)  # Increased font size
+        self._font_metrics = QFontMetrics(self._font)
+        self._arc_pen = QPen(self._color, self.RING_WIDTH, Qt.SolidLine, Qt.RoundCap)
+        self._text_pen = QPen(self._text_color)
+        self._angle = 0
+        self._text_rect = QRect()
+    
     def setValue(self, value):
-        self._value = max(0, min(value, self._maximum))
-        self.update()
+        self.setState(value=value)
     
     def setMaximum(self, maximum):
-        self._maximum = maximum
-        self.update()
+        self.setState(maximum=maximum)
     
     def setText(self, text):
-        self._text = text
-        self.update()
+        self.setState(text=text)
     
     def setColor(self, color):
-        self._color = color
-        self.update()
+        self.setState(color=color)
     
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        # Calculate geometry
+    def setState(self, value=None, maximum=None, text=None, color=None):
+        """Change any of the properties at once; repaints only what changed"""
+        if maximum is not None:
+            self._maximum = maximum
+        if value is not None:
+            self._value = value
+        self._value = max(0, min(self._value, self._maximum))
+        
+        dirty = QRegion()
+        angle = int(360 * self._value / self._maximum) if self._maximum > 0 else 0
+        if color is not None and color != self._color:
+            self._color = QColor(color)
+            self._arc_pen = QPen(self._color, self.RING_WIDTH, Qt.SolidLine, Qt.RoundCap)
+            dirty |= QRegion(self.arc_rect(0, max(angle, self._angle)))
+        if angle != self._angle:
+            dirty |= QRegion(self.arc_rect(self._angle, angle))
+            self._angle = angle
+        if text is not None and text != self._text:
+            self._text = text
+            new_rect = self._font_metrics.boundingRect(self.rect(), Qt.AlignCenter, text)
+            dirty |= QRegion(self._text_rect.united(new_rect).adjusted(-2, -2, 2, 2))
+            self._text_rect = new_rect
+        
+        if not dirty.isEmpty():
+            self.update(dirty)
+    
+    def ring_geometry(self):
         rect = self.rect()
         center = rect.center()
         radius = min(rect.width(), rect.height()) // 2 - 25
-        
-        # Draw background circle
-        painter.setPen(QPen(self._background_color, 10))
-        painter.drawEllipse(center.x() - radius, center.y() - radius, 
-                          radius * 2, radius * 2)
+        return center, radius
+    
+    def arc_rect(self, start_angle, end_angle):
+        """Bounding box of the ring between two clockwise angles from 12 o'clock"""
+        center, radius = self.ring_geometry()
+        low, high = sorted((start_angle, end_angle))
+        # The sweep's extent is set by its end points and any of the four
+        # compass points it passes
+        angles = [low, high] + [a for a in (0, 90, 180, 270, 360) if low < a < high]
+        xs, ys = [], []
+        for angle in angles:
+            radians = math.radians(angle)
+            xs.append(center.x() + radius * math.sin(radians))
+            ys.append(center.y() - radius * math.cos(radians))
+        margin = self.RING_WIDTH // 2 + 2
+        return QRect(int(min(xs)) - margin, int(min(ys)) - margin,
+                     int(max(xs) - min(xs)) + 2 * margin + 1,
+                     int(max(ys) - min(ys)) + 2 * margin + 1)
+    
+    def ring_pixmap(self):
+        ratio = self.devicePixelRatioF()
+        key = (self.width(), self.height(), ratio, self._background_color.rgba())
+        pixmap = self._ring_cache.get(key)
+        if pixmap is None:
+            pixmap = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            center, radius = self.ring_geometry()
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(QPen(self._background_color, self.RING_WIDTH))
+            painter.drawEllipse(center.x() - radius, center.y() - radius,
+                                radius * 2, radius * 2)
+            painter.end()
+            self._ring_cache[key] = pixmap
+        return pixmap
+    
+    def paintEvent(self, event):
+        # Qt clips this to the region passed to update(), so a tick that
+        # only moved the text or a degree of arc touches just those pixels
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.ring_pixmap())
+        painter.setRenderHint(QPainter.Antialiasing)
+        center, radius = self.ring_geometry()
         
         # Draw progress arc
-        if self._maximum > 0:
-            progress_angle = int(360 * self._value / self._maximum)
-            painter.setPen(QPen(self._color, 10, Qt.SolidLine, Qt.RoundCap))
+        if self._angle:
+            painter.setPen(self._arc_pen)
             painter.drawArc(center.x() - radius, center.y() - radius,
-                          radius * 2, radius * 2, 90 * 16, -progress_angle * 16)
+                          radius * 2, radius * 2, 90 * 16, -self._angle * 16)
         
         # Draw text
-        painter.setPen(self._text_color)
-        font = QFont("Arial", 32, QFont.Bold)  # Increased font size
-        painter.setFont(font)
-        painter.drawText(rect, Qt.AlignCenter, self._text)
+        if self._text and event.rect().intersects(self._text_rect):
+            painter.setPen(self._text_pen)
+            painter.setFont(self._font)
+            painter.drawText(self.rect(), Qt.AlignCenter, self._text)
 
 # Enhanced Task Card Widget
 class TaskCard(QFrame):
@@ -173,46 +239,31 @@ class TaskCard(QFrame):
         # Title and priority
         header_layout = QHBoxLayout()
         
-        title_label = QLabel(self.task_data[1])
-        title_label.setFont(QFont("Arial", 18, QFont.Bold))  # Increased font size
-        title_label.setStyleSheet("color: #333;")
+        self.title_label = QLabel()
+        self.title_label.setFont(QFont("Arial", 18, QFont.Bold))  # Increased font size
+        self.title_label.setStyleSheet("color: #333;")
         
-        priority_label = QLabel(self.task_data[3])
-        priority_colors = {
-            "High": "#ea4335",
-            "Medium": "#fbbc05", 
-            "Low": "#34a853"
-        }
-        priority_label.setStyleSheet(f"""
-            background-color: {priority_colors.get(self.task_data[3], '#666')};
-            color: white;
-            padding: 6px 15px;
-            border-radius: 15px;
-            font-size: 14px;
-            font-weight: bold;
-        """)
-        priority_label.setMaximumWidth(100)
+        self.priority_label = QLabel()
+        self.priority_label.setMaximumWidth(100)
         
-        header_layout.addWidget(title_label)
-        header_layout.addWidget(priority_label)
+        header_layout.addWidget(self.title_label)
+        header_layout.addWidget(self.priority_label)
         
         # Description
-        desc_label = QLabel(self.task_data[7][:80] + "..." if len(self.task_data[7]) > 80 else self.task_data[7])
-        desc_label.setStyleSheet("color: #666; font-size: 15px;")  # Increased font size
-        desc_label.setWordWrap(True)
+        self.desc_label = QLabel()
+        self.desc_label.setStyleSheet("color: #666; font-size: 15px;")  # Increased font size
+        self.desc_label.setWordWrap(True)
         
         # Due date and status
         footer_layout = QHBoxLayout()
         
-        due_date_label = QLabel(f"📅 Due: {self.task_data[2]}")
-        due_date_label.setStyleSheet("color: #666; font-size: 15px;")  # Increased font size
+        self.due_date_label = QLabel()
+        self.due_date_label.setStyleSheet("color: #666; font-size: 15px;")  # Increased font size
         
-        status_label = QLabel(self.task_data[6])
-        status_color = "#34a853" if self.task_data[6] == "Completed" else "#fbbc05"
-        status_label.setStyleSheet(f"color: {status_color}; font-weight: bold; font-size: 15px;")  # Increased font size
+        self.status_label = QLabel()
         
-        footer_layout.addWidget(due_date_label)
-        footer_layout.addWidget(status_label)
+        footer_layout.addWidget(self.due_date_label)
+        footer_layout.addWidget(self.status_label)
         
         # Action buttons
         button_layout = QHBoxLayout()
@@ -275,11 +326,49 @@ class TaskCard(QFrame):
         button_layout.addStretch()
         
         layout.addLayout(header_layout)
-        layout.addWidget(desc_label)
+        layout.addWidget(self.desc_label)
         layout.addLayout(footer_layout)
         layout.addLayout(button_layout)
         
         self.setLayout(layout)
+        self.update_labels()
+    
+    def set_task(self, task_data):
+        """Show new data for the same task without rebuilding the card"""
+        old_data = self.task_data
+        self.task_data = task_data
+        self.update_labels(old_data)
+    
+    def update_labels(self, old_data=None):
+        # Only touch the labels whose column changed
+        def changed(column):
+            return old_data is None or old_data[column] != self.task_data[column]
+        
+        if changed(1):
+            self.title_label.setText(self.task_data[1])
+        if changed(3):
+            priority_colors = {
+                "High": "#ea4335",
+                "Medium": "#fbbc05", 
+                "Low": "#34a853"
+            }
+            self.priority_label.setText(self.task_data[3])
+            self.priority_label.setStyleSheet(f"""
+                background-color: {priority_colors.get(self.task_data[3], '#666')};
+                color: white;
+                padding: 6px 15px;
+                border-radius: 15px;
+                font-size: 14px;
+                font-weight: bold;
+            """)
+        if changed(7):
+            self.desc_label.setText(self.task_data[7][:80] + "..." if len(self.task_data[7]) > 80 else self.task_data[7])
+        if changed(2):
+            self.due_date_label.setText(f"📅 Due: {self.task_data[2]}")
+        if changed(6):
+            self.status_label.setText(self.task_data[6])
+            status_color = "#34a853" if self.task_data[6] == "Completed" else "#fbbc05"
+            self.status_label.setStyleSheet(f"color: {status_color}; font-weight: bold; font-size: 15px;")  # Increased font size
     
     def setupShadow(self):
         shadow = QGraphicsDropShadowEffect()
@@ -312,6 +401,388 @@ class TaskCard(QFrame):
             widget = widget.parent()
         return None
 
+# List model over the task store rows for the virtualized task list
+class TaskListModel(QAbstractListModel):
+    def __init__(self, worker, parent=None):
+        super().__init__(parent)
+        self._tasks = ()
+        # Pages are read on the database worker, never on the GUI thread
+        self._worker = worker
+        self._fetch_page = None
+        self._page_size = TASK_PAGE_SIZE
+        self._exhausted = True
+        self._fetching = False
+        # Bumped whenever the source changes, so pages still in flight for
+        # an older source are dropped when they arrive
+        self._generation = 0
+    
+    def set_tasks(self, tasks):
+        self._generation += 1
+        self._fetch_page = None
+        self._exhausted = True
+        self._fetching = False
+        self._apply(tasks)
+    
+    def set_source(self, fetch_page, page_size=TASK_PAGE_SIZE):
+        """Page through fetch_page(page_size, after) as the view scrolls.
+
+        The first page is read on the worker and shown when it arrives.
+        Calling it again (e.g. after a mutation) refetches as many rows as
+        are already loaded and applies only the difference.
+        """
+        loaded = len(self._tasks) if self._fetch_page is not None else 0
+        count = max(page_size, loaded)
+        self._generation += 1
+        generation = self._generation
+        self._fetch_page = fetch_page
+        self._page_size = page_size
+        self._fetching = True
+        self._worker.submit(fetch_page, count, None,
+                            callback=lambda rows: self._source_loaded(generation, count, rows))
+    
+    def _source_loaded(self, generation, count, rows):
+        if generation != self._generation:
+            return
+        rows = list(rows or [])
+        self._fetching = False
+        self._exhausted = len(rows) < count
+        self._apply(rows)
+    
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted and not self._fetching
+    
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted or self._fetching:
+            return
+        after = self._tasks[-1] if self._tasks else None
+        generation = self._generation
+        self._fetching = True
+        self._worker.submit(self._fetch_page, self._page_size, after,
+                            callback=lambda rows: self._page_loaded(generation, rows))
+    
+    def _page_loaded(self, generation, rows):
+        if generation != self._generation:
+            return
+        rows = list(rows or [])
+        self._fetching = False
+        self._exhausted = len(rows) < self._page_size
+        if rows:
+            start = len(self._tasks)
+            self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+            self._tasks.extend(rows)
+            self.endInsertRows()
+    
+    def _apply(self, tasks):
+        """Point the model at a new task list, signalling only what changed.
+
+        Keeps a reference to the store's rows; nothing is copied. Rows that
+        kept their id and position get a dataChanged when their content
+        differs, a single contiguous insertion or removal becomes one
+        rowsInserted/rowsRemoved, and anything else resets the model.
+        """
+        old = self._tasks
+        prefix = 0
+        limit = min(len(old), len(tasks))
+        while prefix < limit and old[prefix][0] == tasks[prefix][0]:
+            prefix += 1
+        suffix = 0
+        while (suffix < limit - prefix and
+               old[len(old) - 1 - suffix][0] == tasks[len(tasks) - 1 - suffix][0]):
+            suffix += 1
+        removed = len(old) - prefix - suffix
+        inserted = len(tasks) - prefix - suffix
+        
+        if removed and inserted:
+            self.beginResetModel()
+            self._tasks = tasks
+            self.endResetModel()
+            return
+        if removed:
+            self.beginRemoveRows(QModelIndex(), prefix, prefix + removed - 1)
+            self._tasks = tasks
+            self.endRemoveRows()
+        elif inserted:
+            self.beginInsertRows(QModelIndex(), prefix, prefix + inserted - 1)
+            self._tasks = tasks
+            self.endInsertRows()
+        else:
+            self._tasks = tasks
+        
+        # Rows that survived in place: repaint the ones whose data changed
+        for row in range(prefix):
+            if old[row] != tasks[row]:
+                self.dataChanged.emit(self.index(row), self.index(row))
+        for offset in range(1, suffix + 1):
+            if old[len(old) - offset] != tasks[len(tasks) - offset]:
+                row = len(tasks) - offset
+                self.dataChanged.emit(self.index(row), self.index(row))
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._tasks)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._tasks):
+            return None
+        task = self._tasks[index.row()]
+        if role == TASK_ROLE:
+            return task
+        if role == Qt.DisplayRole:
+            return task[1]
+        return None
+
+# Paints a task row with the TaskCard look instead of creating widgets
+class TaskCardDelegate(QStyledItemDelegate):
+    action_triggered = pyqtSignal(str, object)
+    
+    CARD_HEIGHT = 180
+    SPACING = 12
+    PRIORITY_COLORS = {
+        "High": QColor("#ea4335"),
+        "Medium": QColor("#fbbc05"),
+        "Low": QColor("#34a853")
+    }
+    BUTTONS = (
+        ("complete", "✅ Complete", QColor("#34a853")),
+        ("edit", "✏️ Edit", QColor("#4285f4")),
+        ("delete", "🗑️ Delete", QColor("#ea4335"))
+    )
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Fonts, pens and metrics are created once and shared by every row
+        self.title_font = QFont("Arial", 18, QFont.Bold)
+        self.text_font = QFont("Arial", 11)
+        self.bold_font = QFont("Arial", 11, QFont.Bold)
+        self.badge_font = QFont("Arial", 10, QFont.Bold)
+        self.title_metrics = QFontMetrics(self.title_font)
+        self.text_metrics = QFontMetrics(self.text_font)
+        self.border_pen = QPen(QColor("#e0e0e0"), 2)
+        self.hover_pen = QPen(QColor("#4285f4"), 2)
+        self.title_color = QColor("#333")
+        self.text_color = QColor("#666")
+        self.completed_color = QColor("#34a853")
+        self.pending_color = QColor("#fbbc05")
+    
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.CARD_HEIGHT + self.SPACING)
+    
+    def card_rect(self, rect):
+        return rect.adjusted(10, self.SPACING // 2, -10, -self.SPACING // 2)
+    
+    def button_rects(self, card):
+        x = card.left() + 20
+        y = card.bottom() - 20 - 40
+        rects = []
+        for action, text, color in self.BUTTONS:
+            rects.append((action, text, color, QRect(x, y, 130, 40)))
+            x += 130 + 12
+        return rects
+    
+    def paint(self, painter, option, index):
+        task = index.data(TASK_ROLE)
+        if task is None:
+            return
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        
+        # Card background
+        card = self.card_rect(option.rect)
+        painter.setPen(self.hover_pen if option.state & QStyle.State_MouseOver else self.border_pen)
+        painter.setBrush(Qt.white)
+        painter.drawRoundedRect(card, 15, 15)
+        content = card.adjusted(20, 20, -20, -20)
+        
+        # Title and priority
+        badge = QRect(content.right() - 100, content.top(), 100, 32)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.PRIORITY_COLORS.get(task[3], self.text_color))
+        painter.drawRoundedRect(badge, 15, 15)
+        painter.setPen(Qt.white)
+        painter.setFont(self.badge_font)
+        painter.drawText(badge, Qt.AlignCenter, task[3])
+        
+        title_rect = QRect(content.left(), content.top(), content.width() - 110, 32)
+        painter.setPen(self.title_color)
+        painter.setFont(self.title_font)
+        painter.drawText(title_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                         self.title_metrics.elidedText(task[1], Qt.ElideRight, title_rect.width()))
+        
+        # Description
+        desc_rect = QRect(content.left(), content.top() + 40, content.width(), 22)
+        painter.setPen(self.text_color)
+        painter.setFont(self.text_font)
+        painter.drawText(desc_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                         self.text_metrics.elidedText(task[7], Qt.ElideRight, desc_rect.width()))
+        
+        # Due date and status
+        footer_rect = QRect(content.left(), content.top() + 70, content.width(), 22)
+        painter.drawText(footer_rect, Qt.AlignLeft | Qt.AlignVCenter, f"📅 Due: {task[2]}")
+        painter.setPen(self.completed_color if task[6] == "Completed" else self.pending_color)
+        painter.setFont(self.bold_font)
+        painter.drawText(footer_rect, Qt.AlignRight | Qt.AlignVCenter, task[6])
+        
+        # Action buttons
+        for action, text, color, rect in self.button_rects(card):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(color)
+            painter.drawRoundedRect(rect, 8, 8)
+            painter.setPen(Qt.white)
+            painter.drawText(rect, Qt.AlignCenter, text)
+        
+        painter.restore()
+    
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            task = index.data(TASK_ROLE)
+            for action, text, color, rect in self.button_rects(self.card_rect(option.rect)):
+                if task is not None and rect.contains(event.pos()):
+                    self.action_triggered.emit(action, task[0])
+                    return True
+        return super().editorEvent(event, model, option, index)
+
+# Debounced search/filter pipeline that filters on a worker thread
+class SearchPipeline(QObject):
+    """Runs find_tasks(search_text, filter_selection, cancelled) off the GUI thread.
+
+    Keystrokes restart a short debounce timer; when it fires the latest
+    query is handed to a single worker thread. Every request bumps a
+    generation number, so a stale query sees cancelled() turn True and
+    stops early, and only the newest query's results reach results_ready.
+    """
+    results_ready = pyqtSignal(object)
+    _finished = pyqtSignal(int, object)
+    
+    def __init__(self, find_tasks, delay_ms=150, parent=None):
+        super().__init__(parent)
+        self.find_tasks = find_tasks
+        self._generation = 0
+        self._pending = None
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(delay_ms)
+        self._debounce.timeout.connect(self._dispatch)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._finished.connect(self._on_finished)
+    
+    def request(self, search_text, filter_selection, immediate=False):
+        self._generation += 1
+        self._pending = (search_text, filter_selection)
+        if immediate:
+            self._debounce.stop()
+            self._dispatch()
+        else:
+            self._debounce.start()
+    
+    def _dispatch(self):
+        if self._pending is None:
+            return
+        search_text, filter_selection = self._pending
+        self._pending = None
+        # Drop queued jobs that have not started yet; a running one will
+        # notice the new generation and cancel itself
+        self._pool.clear()
+        self._pool.start(_SearchJob(self, self._generation, search_text, filter_selection))
+    
+    def cancel(self):
+        """Drop the pending query; a running one cancels itself"""
+        self._generation += 1
+        self._pending = None
+        self._debounce.stop()
+    
+    def is_stale(self, generation):
+        return generation != self._generation
+    
+    def _on_finished(self, generation, tasks):
+        if not self.is_stale(generation):
+            self.results_ready.emit(tasks)
+
+class _SearchJob(QRunnable):
+    def __init__(self, pipeline, generation, search_text, filter_selection):
+        super().__init__()
+        self.pipeline = pipeline
+        self.generation = generation
+        self.search_text = search_text
+        self.filter_selection = filter_selection
+    
+    def run(self):
+        def cancelled():
+            return self.pipeline.is_stale(self.generation)
+        
+        if cancelled():
+            return
+        try:
+            tasks = self.pipeline.find_tasks(self.search_text, self.filter_selection, cancelled)
+        except Exception as e:
+            print(f"Error searching tasks: {e}")
+            return
+        if tasks is not None and not cancelled():
+            self.pipeline._finished.emit(self.generation, tasks)
+
+# Runs database calls off the GUI thread
+class DatabaseWorker(QObject):
+    """Background thread for database calls, with results delivered on the GUI thread.
+
+    Calls run one at a time in the order they were submitted, so writes are
+    never reordered. A call submitted with a key replaces a still-queued
+    call with the same key: the latest arguments win and every callback
+    gets the single result, so bursts of refreshes collapse into one query.
+    """
+    _done = pyqtSignal(object, object, object)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._queue = deque()
+        self._queued_by_key = {}
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._done.connect(self._deliver)
+        self._thread = threading.Thread(target=self._run, name="DatabaseWorker", daemon=True)
+        self._thread.start()
+    
+    def submit(self, func, *args, callback=None, key=None):
+        with self._condition:
+            job = self._queued_by_key.get(key) if key is not None else None
+            if job is not None:
+                job[1] = args
+                if callback is not None:
+                    job[2].append(callback)
+                return
+            job = [func, args, [callback] if callback is not None else [], key]
+            if key is not None:
+                self._queued_by_key[key] = job
+            self._queue.append(job)
+            self._condition.notify()
+    
+    def stop(self, timeout=None):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join(timeout)
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._stopped:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                func, args, callbacks, key = self._queue.popleft()
+                if key is not None:
+                    self._queued_by_key.pop(key, None)
+            try:
+                result, error = func(*args), None
+            except Exception as e:
+                result, error = None, e
+            # Queued across threads: _deliver runs on the GUI thread
+            self._done.emit(callbacks, result, error)
+    
+    def _deliver(self, callbacks, result, error):
+        if error is not None:
+            print(f"Database error: {error}")
+        for callback in callbacks:
+            callback(result)
+
 # Statistics Card Widget
 class StatCard(QFrame):
     def __init__(self, title, value, icon, color):
@@ -469,10 +940,23 @@ class SmartTaskManager(QMainWindow):
         """)
         
         try:
-            self.db = DatabaseHandler()
+            self.db = DatabaseHandler(data_dir=DATA_DIR)
         except Exception as e:
             QMessageBox.critical(self, "Database Error", f"Could not initialize database. Using demo mode.\n{str(e)}")
             self.db = DatabaseHandler()
+        # All reads/writes triggered by the UI go through this worker
+        self.db_worker = DatabaseWorker(self)
+        self.startup_timer = StartupTimer()
+        # Settings are read once here and written back in batches, on the
+        # database worker like every other write
+        self.settings = SettingsCache(
+            self.db, SETTINGS_DEFAULTS,
+            submit=lambda flush: self.db_worker.submit(flush, key="save_settings"))
+        self.settings.load()
+        self.settings_notice_timer = QTimer(self)
+        self.settings_notice_timer.setSingleShot(True)
+        self.settings_notice_timer.setInterval(500)
+        self.settings_notice_timer.timeout.connect(self.update_timer_for_settings_change)
         
         # Create main widget and layout
         self.main_widget = QWidget()
@@ -484,19 +968,55 @@ class SmartTaskManager(QMainWindow):
         self.tabs = QTabWidget()
         self.main_layout.addWidget(self.tabs)
         
-        # Create all tabs
+        # Only the task tab is built up front; the others are empty
+        # placeholders filled in the first time they are selected
         self.create_task_management_tab()
-        self.create_dashboard_tab()
-        self.create_pomodoro_tab()
-        self.create_settings_tab()
-        
-        # Load initial data
-        self.load_tasks()
-        self.update_dashboard()
+        self.dashboard_tab = QWidget()
+        self.tabs.addTab(self.dashboard_tab, "📊 Dashboard")
+        self.pomodoro_tab = QWidget()
+        self.tabs.addTab(self.pomodoro_tab, "🍅 Pomodoro")
+        self.settings_tab = QWidget()
+        self.tabs.addTab(self.settings_tab, "⚙️ Settings")
+        self.pending_tabs = {
+            self.dashboard_tab: self.create_dashboard_tab,
+            self.pomodoro_tab: self.create_pomodoro_tab,
+            self.settings_tab: self.create_settings_tab,
+        }
+        self.tabs.currentChanged.connect(self.build_tab)
         
-        # Initialize Pomodoro timer
+        # Initialize Pomodoro timer state (its widgets come with the tab)
         self.setup_pomodoro_timer()
         
+        # Load initial data (the dashboard is filled in once it arrives)
+        self._load_started = None
+        self.load_tasks()
+        self.startup_timer.mark('window')
+    
+    def build_tab(self, index):
+        """Build a deferred tab the first time it is shown"""
+        builder = self.pending_tabs.pop(self.tabs.widget(index), None)
+        if builder is not None:
+            builder()
+    
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if 'first_paint' not in self.startup_timer.marks:
+            self.startup_timer.mark('first_paint')
+            # Let the paint finish before reporting
+            QTimer.singleShot(0, self.startup_timer.report)
+    
+    def closeEvent(self, event):
+        # Let queued writes finish before the window goes away
+        self.settings.close()
+        self.db_worker.stop(timeout=5)
+        # Snapshot the session's changes so the next start has little to replay
+        self.db.close()
+        # Timings collected this session, as JSON or (.prom) Prometheus text
+        metrics_path = os.environ.get("TASK_MANAGER_METRICS")
+        if metrics_path:
+            metrics.REGISTRY.export(metrics_path)
+        super().closeEvent(event)
+        
     def create_task_management_tab(self):
         self.task_tab = QWidget()
         self.tabs.addTab(self.task_tab, "📝 Tasks")
@@ -546,6 +1066,8 @@ class SmartTaskManager(QMainWindow):
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("🔍 Search tasks by title, description, or category...")
         self.search_input.setClearButtonEnabled(True)
+        self.search_pipeline = SearchPipeline(self.find_tasks, parent=self)
+        self.search_pipeline.results_ready.connect(self.show_filtered_tasks)
         self.search_input.textChanged.connect(self.search_tasks)
         
         self.filter_combo = QComboBox()
@@ -574,15 +1096,41 @@ class SmartTaskManager(QMainWindow):
         self.tasks_layout = QVBoxLayout()
         self.tasks_scroll_widget.setLayout(self.tasks_layout)
         scroll_area.setWidget(self.tasks_scroll_widget)
+        self.task_scroll_area = scroll_area
+        
+        # Cards on screen keyed by task id, reconciled by show_tasks; the
+        # layout always ends with a single stretch
+        self.task_cards = {}
+        self.no_tasks_label = None
+        self.tasks_layout.addStretch()
+        
+        # Virtualized list for large task sets
+        self.task_model = TaskListModel(self.db_worker, self)
+        self.task_delegate = TaskCardDelegate(self)
+        self.task_delegate.action_triggered.connect(self.on_task_action, Qt.QueuedConnection)
+        self.task_list_view = QListView()
+        self.task_list_view.setModel(self.task_model)
+        self.task_list_view.setItemDelegate(self.task_delegate)
+        self.task_list_view.setUniformItemSizes(True)
+        self.task_list_view.setMouseTracking(True)
+        self.task_list_view.setSelectionMode(QListView.NoSelection)
+        self.task_list_view.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.task_list_view.setStyleSheet("""
+            QListView {
+                border: none;
+                background: transparent;
+            }
+        """)
+        
+        self.task_list_stack = QStackedWidget()
+        self.task_list_stack.addWidget(self.task_scroll_area)
+        self.task_list_stack.addWidget(self.task_list_view)
         
         layout.addWidget(controls_group)
         layout.addWidget(filter_group)
-        layout.addWidget(scroll_area, 1)
+        layout.addWidget(self.task_list_stack, 1)
     
     def create_dashboard_tab(self):
-        self.dashboard_tab = QWidget()
-        self.tabs.addTab(self.dashboard_tab, "📊 Dashboard")
-        
         layout = QVBoxLayout()
         layout.setSpacing(25)
         layout.setContentsMargins(25, 25, 25, 25)
@@ -619,11 +1167,10 @@ class SmartTaskManager(QMainWindow):
         layout.addWidget(stats_group)
         layout.addWidget(progress_group)
         layout.addStretch()
+        
+        self.update_dashboard()
     
     def create_pomodoro_tab(self):
-        self.pomodoro_tab = QWidget()
-        self.tabs.addTab(self.pomodoro_tab, "🍅 Pomodoro")
-        
         layout = QVBoxLayout()
         layout.setSpacing(25)
         layout.setContentsMargins(25, 25, 25, 25)
@@ -684,11 +1231,10 @@ class SmartTaskManager(QMainWindow):
         timer_group.setLayout(timer_layout)
         
         layout.addWidget(timer_group)
+        
+        self.reset_timer_display()
     
     def create_settings_tab(self):
-        self.settings_tab = QWidget()
-        self.tabs.addTab(self.settings_tab, "⚙️ Settings")
-        
         layout = QVBoxLayout()
         layout.setSpacing(25)
         layout.setContentsMargins(25, 25, 25, 25)
@@ -702,21 +1248,21 @@ class SmartTaskManager(QMainWindow):
         
         self.work_duration_spin = QSpinBox()
         self.work_duration_spin.setRange(1, 60)
-        self.work_duration_spin.setValue(int(self.db.get_setting('work_duration')))
+        self.work_duration_spin.setValue(self.settings.get_int('work_duration'))
         self.work_duration_spin.setSuffix(" minutes")
         # Connect to real-time update
         self.work_duration_spin.valueChanged.connect(self.on_work_duration_changed)
         
         self.break_duration_spin = QSpinBox()
         self.break_duration_spin.setRange(1, 30)
-        self.break_duration_spin.setValue(int(self.db.get_setting('break_duration')))
+        self.break_duration_spin.setValue(self.settings.get_int('break_duration'))
         self.break_duration_spin.setSuffix(" minutes")
         # Connect to real-time update
         self.break_duration_spin.valueChanged.connect(self.on_break_duration_changed)
         
         self.long_break_duration_spin = QSpinBox()
         self.long_break_duration_spin.setRange(1, 60)
-        self.long_break_duration_spin.setValue(int(self.db.get_setting('long_break_duration')))
+        self.long_break_duration_spin.setValue(self.settings.get_int('long_break_duration'))
         self.long_break_duration_spin.setSuffix(" minutes")
         # Connect to real-time update
         self.long_break_duration_spin.valueChanged.connect(self.on_long_break_duration_changed)
@@ -740,179 +1286,141 @@ class SmartTaskManager(QMainWindow):
     
     def on_work_duration_changed(self, value):
         """Called when work duration setting changes"""
-        self.db.update_setting('work_duration', str(value))
-        self.update_timer_for_settings_change()
+        self.change_setting('work_duration', value)
     
     def on_break_duration_changed(self, value):
         """Called when break duration setting changes"""
-        self.db.update_setting('break_duration', str(value))
-        self.update_timer_for_settings_change()
+        self.change_setting('break_duration', value)
     
     def on_long_break_duration_changed(self, value):
         """Called when long break duration setting changes"""
-        self.db.update_setting('long_break_duration', str(value))
-        self.update_timer_for_settings_change()
+        self.change_setting('long_break_duration', value)
+    
+    def change_setting(self, name, value):
+        # The cache batches the database write; the timer is updated once
+        # the burst of spinbox steps is over
+        if self.settings.set(name, value):
+            self.settings_notice_timer.start()
     
     def update_timer_for_settings_change(self):
         """Update the current timer when settings change"""
-        # If timer is not running and not started, update the display
-        if not self.is_timer_running and self.timer_remaining == 0:
-            # Reset to new work duration
-            work_duration = int(self.db.get_setting('work_duration'))
-            self.timer_duration = work_duration * 60
-            self.circular_progress.setMaximum(self.timer_duration)
-            self.circular_progress.setValue(0)
-            minutes = work_duration
-            self.circular_progress.setText(f"{minutes:02d}:00")
-        
-        # If timer is currently running or paused, adjust the current session
-        elif self.timer_remaining > 0:
-            if self.is_work_session:
-                # Update work session with new duration
-                new_duration = int(self.db.get_setting('work_duration')) * 60
-                # Calculate how much time has passed
-                elapsed_time = self.timer_duration - self.timer_remaining
-                
-                # If the new duration is longer than elapsed time, extend the session
-                if new_duration > elapsed_time:
-                    self.timer_duration = new_duration
-                    self.timer_remaining = new_duration - elapsed_time
-                    self.circular_progress.setMaximum(self.timer_duration)
-                    
-                    # Update display
-                    minutes = self.timer_remaining // 60
-                    seconds = self.timer_remaining % 60
-                    self.circular_progress.setText(f"{minutes:02d}:{seconds:02d}")
-                    
-                    # Update progress
-                    self.circular_progress.setValue(elapsed_time)
-                else:
-                    # If new duration is shorter and already exceeded, complete the session
-                    if elapsed_time >= new_duration:
-                        self.timer_remaining = 0
-                        self.update_timer()  # This will trigger session completion
-            else:
-                # Update break session with new duration
-                new_duration = int(self.db.get_setting('break_duration')) * 60
-                elapsed_time = self.timer_duration - self.timer_remaining
-                
-                if new_duration > elapsed_time:
-                    self.timer_duration = new_duration
-                    self.timer_remaining = new_duration - elapsed_time
-                    self.circular_progress.setMaximum(self.timer_duration)
-                    
-                    # Update display
-                    minutes = self.timer_remaining // 60
-                    seconds = self.timer_remaining % 60
-                    self.circular_progress.setText(f"{minutes:02d}:{seconds:02d}")
-                    
-                    # Update progress
-                    self.circular_progress.setValue(elapsed_time)
-                else:
-                    # If new duration is shorter and already exceeded, complete the session
-                    if elapsed_time >= new_duration:
-                        self.timer_remaining = 0
-                        self.update_timer()  # This will trigger session completion
+        # Time already spent in a running or paused session is kept; a
+        # session the new length has already used up ends right away
+        self.pomodoro.set_durations(self.settings.get_int('work_duration') * 60,
+                                    self.settings.get_int('break_duration') * 60)
+        if self.pomodoro.remaining() == 0:
+            self.update_timer()  # This will trigger session completion
+        else:
+            self.refresh_timer_display()
+            self.schedule_timer_tick()
         
         # Show notification about the change
         QMessageBox.information(self, "Settings Updated", 
                               "⚡ Timer settings have been updated and applied to the current session!")
     
     def setup_pomodoro_timer(self):
+        # The engine owns the countdown; the QTimer is single-shot and only
+        # re-armed for when the display next needs to change
+        self.pomodoro = PomodoroEngine(self.settings.get_int('work_duration') * 60,
+                                       self.settings.get_int('break_duration') * 60)
         self.timer = QTimer()
+        self.timer.setSingleShot(True)
         self.timer.timeout.connect(self.update_timer)
-        self.timer_duration = 0
-        self.timer_remaining = 0
-        self.is_work_session = True
-        self.is_timer_running = False
-        
-        # Initialize circular progress with current work duration
-        work_duration = int(self.db.get_setting('work_duration'))
-        self.circular_progress.setText(f"{work_duration:02d}:00")
-        self.circular_progress.setMaximum(work_duration * 60)
-        self.circular_progress.setValue(0)
+        self.tabs.currentChanged.connect(self.update_timer_visibility)
+    
+    def reset_timer_display(self):
+        # Red for work, green for break
+        self.refresh_timer_display(QColor(234, 67, 53) if self.pomodoro.is_work_session
+                                   else QColor(52, 168, 83))
+    
+    def refresh_timer_display(self, color=None):
+        if self.pomodoro_tab in self.pending_tabs:
+            return
+        remaining = self.pomodoro.remaining_seconds()
+        # One call, so a tick costs at most one (partial) repaint
+        self.circular_progress.setState(value=self.pomodoro.duration - remaining,
+                                        maximum=self.pomodoro.duration,
+                                        text=f"{remaining // 60:02d}:{remaining % 60:02d}",
+                                        color=color)
+    
+    def schedule_timer_tick(self):
+        interval = self.pomodoro.next_interval()
+        if interval is None:
+            self.timer.stop()
+        else:
+            self.timer.start(interval)
+    
+    def update_timer_visibility(self, *args):
+        """Tick once a second while the timer is on screen, rarely otherwise"""
+        visible = (self.isVisible() and not self.isMinimized()
+                   and self.tabs.currentWidget() is self.pomodoro_tab)
+        if visible != self.pomodoro.visible:
+            self.pomodoro.visible = visible
+            if self.pomodoro.running:
+                # Catch the display up and switch cadence now
+                self.update_timer()
+    
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self.update_timer_visibility()
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_timer_visibility()
+    
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_timer_visibility()
     
     def start_pomodoro(self):
-        if not self.is_timer_running:
-            if self.timer_remaining == 0:
-                # Start new session with current settings
-                if self.is_work_session:
-                    duration = int(self.db.get_setting('work_duration'))
-                    self.circular_progress.setColor(QColor(234, 67, 53))  # Red for work
-                else:
-                    duration = int(self.db.get_setting('break_duration'))
-                    self.circular_progress.setColor(QColor(52, 168, 83))  # Green for break
-                
-                self.timer_duration = duration * 60
-                self.timer_remaining = self.timer_duration
-                self.circular_progress.setMaximum(self.timer_duration)
+        if not self.pomodoro.running:
+            resumed = self.pomodoro.elapsed() > 0
+            self.reset_timer_display()
+            self.pomodoro.start()
+            self.schedule_timer_tick()
             
-            self.is_timer_running = True
-            self.timer.start(1000)  # Update every second
-            
-            self.start_timer_btn.setText("▶️ Resume" if self.timer_remaining < self.timer_duration else "▶️ Start")
+            self.start_timer_btn.setText("▶️ Resume" if resumed else "▶️ Start")
             self.start_timer_btn.setEnabled(False)
             self.pause_timer_btn.setEnabled(True)
     
     def pause_pomodoro(self):
-        if self.is_timer_running:
+        if self.pomodoro.running:
+            self.pomodoro.pause()
             self.timer.stop()
-            self.is_timer_running = False
+            self.refresh_timer_display()
             self.start_timer_btn.setEnabled(True)
             self.pause_timer_btn.setEnabled(False)
     
     def stop_pomodoro(self):
         self.timer.stop()
-        self.is_timer_running = False
-        self.timer_remaining = 0
-        self.circular_progress.setValue(0)
         
         # Reset to work session and current work duration
-        self.is_work_session = True
-        work_duration = int(self.db.get_setting('work_duration'))
-        self.circular_progress.setText(f"{work_duration:02d}:00")
-        self.circular_progress.setColor(QColor(234, 67, 53))  # Red for work
+        self.pomodoro.stop()
+        self.reset_timer_display()
         
         self.start_timer_btn.setText("▶️ Start")
         self.start_timer_btn.setEnabled(True)
         self.pause_timer_btn.setEnabled(False)
     
+    @metrics.timed("gui_slot_seconds", slot="update_timer")
     def update_timer(self):
-        if self.timer_remaining > 0:
-            self.timer_remaining -= 1
-            
-            # Update circular progress
-            elapsed = self.timer_duration - self.timer_remaining
-            self.circular_progress.setValue(elapsed)
-            
-            # Update time display
-            minutes = self.timer_remaining // 60
-            seconds = self.timer_remaining % 60
-            self.circular_progress.setText(f"{minutes:02d}:{seconds:02d}")
+        # However late this tick is, the engine reads the time off the clock
+        finished = self.pomodoro.tick()
+        if finished is None:
+            self.refresh_timer_display()
+            self.schedule_timer_tick()
+            return
+        
+        # Timer finished; the engine has already set up the next session
+        self.timer.stop()
+        self.reset_timer_display()
+        if finished == "work":
+            QMessageBox.information(self, "Pomodoro Complete!", "Great work! Time for a break! 🎉")
         else:
-            # Timer finished
-            self.timer.stop()
-            self.is_timer_running = False
-            
-            if self.is_work_session:
-                QMessageBox.information(self, "Pomodoro Complete!", "Great work! Time for a break! 🎉")
-                # Switch to break with current break duration
-                break_duration = int(self.db.get_setting('break_duration'))
-                self.timer_duration = break_duration * 60
-                self.timer_remaining = self.timer_duration
-                self.circular_progress.setMaximum(self.timer_duration)
-                self.circular_progress.setColor(QColor(52, 168, 83))  # Green for break
-                self.is_work_session = False
-            else:
-                QMessageBox.information(self, "Break Complete!", "Break's over! Ready to get back to work? 💪")
-                # Switch back to work with current work duration
-                work_duration = int(self.db.get_setting('work_duration'))
-                self.timer_duration = work_duration * 60
-                self.timer_remaining = work_duration * 60
-                self.circular_progress.setMaximum(self.timer_duration)
-                self.circular_progress.setColor(QColor(234, 67, 53))  # Red for work
-                self.is_work_session = True
-            
+            QMessageBox.information(self, "Break Complete!", "Break's over! Ready to get back to work? 💪")
+        
+        if self.pomodoro_tab not in self.pending_tabs:
             self.start_timer_btn.setText("▶️ Start")
             self.start_timer_btn.setEnabled(True)
             self.pause_timer_btn.setEnabled(False)
@@ -928,16 +1436,41 @@ class SmartTaskManager(QMainWindow):
             QMessageBox.warning(self, "Error", f"Failed to save settings: {str(e)}")
     
     def load_tasks(self):
-        # Clear existing task cards
-        for i in reversed(range(self.tasks_layout.count())):
-            child = self.tasks_layout.itemAt(i).widget()
-            if child:
-                child.setParent(None)
-        
-        # Load tasks from database
-        tasks = self.db.get_tasks()
+        # Load tasks from database on the worker thread; repeated reloads
+        # queued behind a slow query collapse into one (and are timed from
+        # the first request until the list is shown)
+        if self._load_started is None:
+            self._load_started = time.perf_counter()
+        self.db_worker.submit(self.read_task_list, key="load_tasks", callback=self.show_task_list)
+    
+    def read_task_list(self):
+        """Runs on the database worker; large stores are paged into the
+        virtualized list instead of being loaded all at once"""
+        stats = self.db.get_stats()
+        tasks = None
+        if stats['total'] <= VIRTUAL_LIST_THRESHOLD:
+            tasks = self.db.get_tasks_page(VIRTUAL_LIST_THRESHOLD)
+        return stats, tasks
+    
+    def show_task_list(self, result):
+        try:
+            self.display_task_list(result)
+        finally:
+            if self._load_started is not None:
+                metrics.REGISTRY.observe("gui_slot_seconds", time.perf_counter() - self._load_started,
+                                         (("slot", "load_tasks"),))
+                self._load_started = None
+    
+    def display_task_list(self, result):
+        if result is None:
+            return
+        stats, tasks = result
+        if tasks is None:
+            self.show_task_pages()
+        else:
+            self.show_tasks(tasks)
         
-        if not tasks:
+        if not stats['total']:
             no_tasks_label = QLabel("📝 No tasks found. Click 'Add New Task' to get started!")
             no_tasks_label.setStyleSheet("""
                 color: #666;
@@ -949,19 +1482,94 @@ class SmartTaskManager(QMainWindow):
                 border: 3px dashed #ddd;
             """)
             no_tasks_label.setAlignment(Qt.AlignCenter)
-            self.tasks_layout.addWidget(no_tasks_label)
+            self.set_no_tasks_label(no_tasks_label)
+        
+        self.update_dashboard(stats)
+        if 'interactive' not in self.startup_timer.marks:
+            self.startup_timer.mark('interactive')
+            self.startup_timer.report()
+    
+    def show_tasks(self, tasks):
+        """Show tasks as cards, or in the virtualized list when there are many"""
+        self.set_no_tasks_label(None)
+        if len(tasks) > VIRTUAL_LIST_THRESHOLD:
+            # Paged in like the store, so the GUI thread only handles the
+            # rows loaded so far rather than the whole result
+            self.reconcile_cards(())
+            self.task_model.set_source(list_pages(tasks))
+            self.task_list_stack.setCurrentWidget(self.task_list_view)
         else:
-            for task in tasks:
-                task_card = TaskCard(task, self.tasks_scroll_widget)
-                self.tasks_layout.addWidget(task_card)
+            self.task_model.set_tasks(())
+            self.reconcile_cards(tasks)
+            self.task_list_stack.setCurrentWidget(self.task_scroll_area)
+    
+    def show_task_pages(self):
+        """Show all tasks in the virtualized list, fetched page by page"""
+        self.set_no_tasks_label(None)
+        self.reconcile_cards(())
+        self.task_model.set_source(self.db.get_tasks_page)
+        self.task_list_stack.setCurrentWidget(self.task_list_view)
+    
+    def reconcile_cards(self, tasks):
+        """Bring the on-screen cards in line with tasks, keyed by task id.
+
+        Cards for removed tasks are dropped, new tasks get a new card, and
+        existing cards are only updated (or moved) when their task changed,
+        so completing one task touches exactly one card.
+        """
+        scroll_bar = self.task_scroll_area.verticalScrollBar()
+        scroll_position = scroll_bar.value()
+        
+        task_ids = {task[0] for task in tasks}
+        for task_id in [task_id for task_id in self.task_cards if task_id not in task_ids]:
+            card = self.task_cards.pop(task_id)
+            self.tasks_layout.removeWidget(card)
+            card.setParent(None)
+        
+        for position, task in enumerate(tasks):
+            card = self.task_cards.get(task[0])
+            if card is None:
+                card = TaskCard(task, self.tasks_scroll_widget)
+                self.task_cards[task[0]] = card
+                self.tasks_layout.insertWidget(position, card)
+                continue
+            if card.task_data != task:
+                card.set_task(task)
+            if self.tasks_layout.indexOf(card) != position:
+                self.tasks_layout.removeWidget(card)
+                self.tasks_layout.insertWidget(position, card)
         
-        self.tasks_layout.addStretch()
-        self.update_dashboard()
+        scroll_bar.setValue(scroll_position)
+    
+    def set_no_tasks_label(self, label):
+        if self.no_tasks_label is not None:
+            self.tasks_layout.removeWidget(self.no_tasks_label)
+            self.no_tasks_label.setParent(None)
+        self.no_tasks_label = label
+        if label is not None:
+            self.tasks_layout.insertWidget(0, label)
+    
+    def on_task_action(self, action, task_id):
+        if action == "complete":
+            self.mark_task_completed_by_id(task_id)
+        elif action == "edit":
+            self.edit_task_by_id(task_id)
+        elif action == "delete":
+            self.delete_task_by_id(task_id)
     
-    def update_dashboard(self):
-        tasks = self.db.get_tasks()
+    @metrics.timed("gui_slot_seconds", slot="update_dashboard")
+    def update_dashboard(self, stats=None):
+        # Counts are maintained by the task store on every mutation; an
+        # unbuilt dashboard reads them itself when first shown
+        if self.dashboard_tab in self.pending_tabs:
+            return
+        if stats is None:
+            # Read on the worker; the counts come back through this slot
+            self.db_worker.submit(self.db.get_stats, key="get_stats",
+                                  callback=lambda stats: stats and self.update_dashboard(stats))
+            return
         
-        if not tasks:
+        if not stats['total']:
             self.total_tasks_card.update_value("0")
             self.completed_tasks_card.update_value("0 (0%)")
             self.pending_tasks_card.update_value("0 (0%)")
@@ -970,21 +1578,10 @@ class SmartTaskManager(QMainWindow):
             self.progress_bar.setFormat("No tasks yet")
             return
         
-        total_tasks = len(tasks)
-        completed_tasks = len([t for t in tasks if t[6] == "Completed"])
-        pending_tasks = len([t for t in tasks if t[6] == "Pending"])
-        
-        # Calculate overdue tasks
-        today = datetime.now().date()
-        overdue_tasks = 0
-        for task in tasks:
-            if task[6] == "Pending":
-                try:
-                    due_date = datetime.strptime(task[2], "%Y-%m-%d").date()
-                    if due_date < today:
-                        overdue_tasks += 1
-                except:
-                    pass
+        total_tasks = stats['total']
+        completed_tasks = stats['by_status'].get("Completed", 0)
+        pending_tasks = stats['by_status'].get("Pending", 0)
+        overdue_tasks = stats['overdue']
         
         # Update stat cards
         completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
@@ -1001,29 +1598,41 @@ class SmartTaskManager(QMainWindow):
         self.progress_bar.setFormat(f"{completion_rate:.0f}% Complete - {'Excellent!' if completion_rate >= 80 else 'Keep going!' if completion_rate >= 50 else 'You can do it!'}")
     
     def mark_task_completed_by_id(self, task_id):
-        task = self.db.get_task_by_id(task_id)
+        self.db_worker.submit(self.db.get_task_by_id, task_id,
+                              callback=lambda task: self.complete_loaded_task(task_id, task))
+    
+    def complete_loaded_task(self, task_id, task):
         if task and task[6] == "Pending":
             task_data = (
                 task[1], task[2], task[3], task[4], 
                 task[5], "Completed", task[7], task[8], task[9]
             )
-            if self.db.update_task(task_id, task_data):
-                self.load_tasks()
-                QMessageBox.information(self, "Success", "Task marked as completed! 🎉")
-            else:
-                QMessageBox.warning(self, "Error", "Failed to update task")
+            self.db_worker.submit(self.db.update_task, task_id, task_data,
+                                  callback=self.on_task_completed)
         else:
             QMessageBox.information(self, "Info", "Task is already completed or not found")
     
+    def on_task_completed(self, success):
+        if success:
+            self.load_tasks()
+            QMessageBox.information(self, "Success", "Task marked as completed! 🎉")
+        else:
+            QMessageBox.warning(self, "Error", "Failed to update task")
+    
     def edit_task_by_id(self, task_id):
-        task = self.db.get_task_by_id(task_id)
+        self.db_worker.submit(self.db.get_task_by_id, task_id, callback=self.edit_loaded_task)
+    
+    def edit_loaded_task(self, task):
         if task:
             self.show_edit_task_dialog(task)
         else:
             QMessageBox.warning(self, "Error", "Task not found")
     
     def delete_task_by_id(self, task_id):
-        task = self.db.get_task_by_id(task_id)
+        self.db_worker.submit(self.db.get_task_by_id, task_id,
+                              callback=lambda task: self.confirm_delete_task(task_id, task))
+    
+    def confirm_delete_task(self, task_id, task):
         if task:
             reply = QMessageBox.question(
                 self, 
@@ -1034,14 +1643,17 @@ class SmartTaskManager(QMainWindow):
             )
             
             if reply == QMessageBox.Yes:
-                if self.db.delete_task(task_id):
-                    self.load_tasks()
-                    QMessageBox.information(self, "Success", "Task deleted successfully! 🗑️")
-                else:
-                    QMessageBox.warning(self, "Error", "Failed to delete task")
+                self.db_worker.submit(self.db.delete_task, task_id, callback=self.on_task_deleted)
         else:
             QMessageBox.warning(self, "Error", "Task not found")
     
+    def on_task_deleted(self, success):
+        if success:
+            self.load_tasks()
+            QMessageBox.information(self, "Success", "Task deleted successfully! 🗑️")
+        else:
+            QMessageBox.warning(self, "Error", "Failed to delete task")
+    
     def show_add_task_dialog(self):
         dialog = QDialog(self)
         dialog.setWindowTitle("Add New Task")
@@ -1256,7 +1868,11 @@ class SmartTaskManager(QMainWindow):
             self.due_date_input.date().toString("yyyy-MM-dd")  # end_date
         )
         
-        if self.db.add_task(task_data):
+        self.db_worker.submit(self.db.add_task, task_data,
+                              callback=lambda success: self.on_task_added(success, dialog))
+    
+    def on_task_added(self, success, dialog):
+        if success:
             QMessageBox.information(self, "Success", "Task added successfully! ✨")
             dialog.accept()
             self.load_tasks()
@@ -1281,7 +1897,11 @@ class SmartTaskManager(QMainWindow):
             self.edit_due_date_input.date().toString("yyyy-MM-dd")  # end_date
         )
         
-        if self.db.update_task(task_id, task_data):
+        self.db_worker.submit(self.db.update_task, task_id, task_data,
+                              callback=lambda success: self.on_task_updated(success, dialog))
+    
+    def on_task_updated(self, success, dialog):
+        if success:
             QMessageBox.information(self, "Success", "Task updated successfully! ✅")
             dialog.accept()
             self.load_tasks()
@@ -1289,62 +1909,61 @@ class SmartTaskManager(QMainWindow):
             QMessageBox.warning(self, "Error", "Failed to update task")
     
     def search_tasks(self):
-        search_text = self.search_input.text().lower()
-        filter_selection = self.filter_combo.currentText()
-        self.apply_filters(search_text, filter_selection)
+        # Debounced; filtering runs on the search pipeline's worker thread
+        self.request_search()
     
     def filter_tasks(self):
+        self.request_search(immediate=True)
+    
+    def request_search(self, immediate=False):
         search_text = self.search_input.text().lower()
         filter_selection = self.filter_combo.currentText()
-        self.apply_filters(search_text, filter_selection)
+        if filter_selection == "📋 All Tasks" and not search_text.strip():
+            # Nothing to filter: show the whole list the way load_tasks
+            # does, paged for large stores
+            self.search_pipeline.cancel()
+            self.load_tasks()
+        else:
+            self.search_pipeline.request(search_text, filter_selection, immediate)
     
-    def apply_filters(self, search_text, filter_selection):
-        # Clear existing task cards
-        for i in reversed(range(self.tasks_layout.count())):
-            child = self.tasks_layout.itemAt(i).widget()
-            if child:
-                child.setParent(None)
-        
-        # Get all tasks
-        all_tasks = self.db.get_tasks()
-        filtered_tasks = []
-        
-        today = datetime.now().date()
-        
-        for task in all_tasks:
-            # Apply search filter
-            if search_text and search_text not in task[1].lower() and search_text not in task[7].lower() and search_text not in task[4].lower():
-                continue
-            
-            # Apply status/priority filters
-            if filter_selection == "📋 All Tasks":
-                filtered_tasks.append(task)
-            elif filter_selection == "⏳ Pending" and task[6] == "Pending":
-                filtered_tasks.append(task)
-            elif filter_selection == "✅ Completed" and task[6] == "Completed":
-                filtered_tasks.append(task)
-            elif filter_selection == "🔴 High Priority" and task[3] == "High":
-                filtered_tasks.append(task)
-            elif filter_selection == "🟡 Medium Priority" and task[3] == "Medium":
-                filtered_tasks.append(task)
-            elif filter_selection == "🟢 Low Priority" and task[3] == "Low":
-                filtered_tasks.append(task)
-            elif filter_selection == "⚠️ Overdue":
-                try:
-                    due_date = datetime.strptime(task[2], "%Y-%m-%d").date()
-                    if due_date < today and task[6] == "Pending":
-                        filtered_tasks.append(task)
-                except:
-                    pass
-            elif filter_selection == "📅 Due Today":
-                try:
-                    due_date = datetime.strptime(task[2], "%Y-%m-%d").date()
-                    if due_date == today:
-                        filtered_tasks.append(task)
-                except:
-                    pass
-        
+    def filter_query(self, filter_selection):
+        """Map a filter combo entry to DatabaseHandler.query_tasks arguments"""
+        today = datetime.now().date().strftime("%Y-%m-%d")
+        return {
+            "📋 All Tasks": {},
+            "⏳ Pending": {"status": "Pending"},
+            "✅ Completed": {"status": "Completed"},
+            "🔴 High Priority": {"priority": "High"},
+            "🟡 Medium Priority": {"priority": "Medium"},
+            "🟢 Low Priority": {"priority": "Low"},
+            "⚠️ Overdue": {"status": "Pending", "due_before": today},
+            "📅 Due Today": {"due_on": today},
+        }.get(filter_selection)
+    
+    @metrics.timed("search_seconds", step="find_tasks")
+    def find_tasks(self, search_text, filter_selection, cancelled=None):
+        """Return the tasks for a search/filter, or None if cancelled.
+
+        Safe to call from the search pipeline's worker thread. A blank
+        search on "All Tasks" never gets here; request_search pages the
+        whole list in through load_tasks instead.
+        """
+        # Narrow down by the filter combo and the search text through the
+        # store's indexes
+        query = self.filter_query(filter_selection)
+        if query is None:
+            return []
+        tasks = self.db.query_tasks(search=search_text or None, cancelled=cancelled, **query)
+        if tasks is None or (cancelled is not None and cancelled()):
+            return None
+        # Matches come back in insertion order; show them in the list's order
+        tasks.sort(key=due_order)
+        return tasks
+    
+    @metrics.timed("gui_slot_seconds", slot="show_filtered_tasks")
+    def show_filtered_tasks(self, filtered_tasks):
         # Display filtered tasks
+        self.show_tasks(filtered_tasks)
         if not filtered_tasks:
             no_tasks_label = QLabel(f"🔍 No tasks match your search criteria.\n\nTry adjusting your search or filter settings.")
             no_tasks_label.setStyleSheet("""
@@ -1357,13 +1976,7 @@ class SmartTaskManager(QMainWindow):
                 border: 2px dashed #ddd;
             """)
             no_tasks_label.setAlignment(Qt.AlignCenter)
-            self.tasks_layout.addWidget(no_tasks_label)
-        else:
-            for task in filtered_tasks:
-                task_card = TaskCard(task, self.tasks_scroll_widget)
-                self.tasks_layout.addWidget(task_card)
-        
-        self.tasks_layout.addStretch()
+            self.set_no_tasks_label(no_tasks_label)
 
 def main():
     app = QApplication(sys.argv)
@@ -1383,7 +1996,8 @@ def main():
         window = SmartTaskManager()
         window.show()
         
-        # Show welcome message
+        # Show welcome message once the window has painted, without
+        # blocking it
         welcome_msg = QMessageBox(window)
         welcome_msg.setWindowTitle("Welcome! 🎉")
         welcome_msg.setIcon(QMessageBox.Information)
@@ -1400,7 +2014,8 @@ def main():
             "🔥 NEW: Change timer settings and see them applied immediately!"
         )
         welcome_msg.setStandardButtons(QMessageBox.Ok)
-        welcome_msg.show()
+        welcome_msg.setModal(False)
+        QTimer.singleShot(0, welcome_msg.show)
         
         sys.exit(app.exec_())
     except Exception as e:
@@ -0,0 +1,70 @@
+import csv
+import json
+import os
+
+# Column order of DatabaseHandler.add_task / add_tasks task_data tuples
+TASK_COLUMNS = (
+    "title", "description", "due_date", "due_time", "priority",
+    "status", "category", "recurrence", "attachment_path"
+)
+DEFAULTS = {
+    "description": "",
+    "due_date": None,
+    "due_time": None,
+    "priority": "Medium",
+    "status": "Pending",
+    "category": "",
+    "recurrence": "None",
+    "attachment_path": ""
+}
+
+
+def read_records(path):
+    """Yield one dict per task from a .csv, .json (list of objects) or
+    .jsonl (one object per line) file. CSV and JSON lines are streamed."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+    elif extension == ".jsonl":
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif extension == ".json":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        yield from (data["tasks"] if isinstance(data, dict) else data)
+    else:
+        raise ValueError(f"Unsupported import format: {extension or path}")
+
+
+def to_task_data(record, line_number=None):
+    title = (record.get("title") or "").strip()
+    if not title:
+        where = f" (record {line_number})" if line_number is not None else ""
+        raise ValueError(f"Task title is required{where}")
+    task_data = []
+    for column in TASK_COLUMNS:
+        value = record.get(column)
+        # Blank CSV cells fall back to the column default, which also keeps
+        # '' out of the DATE/TIME columns
+        if value is None or value == "":
+            value = DEFAULTS.get(column, value)
+        task_data.append(title if column == "title" else value)
+    return tuple(task_data)
+
+
+def import_tasks(db, path, chunk_size=1000):
+    """Import tasks from path through db.add_tasks in chunked transactions.
+
+    Returns the number of rows inserted, or None if the database reported
+    an error (chunks committed before it are kept). Every record is
+    validated before the first chunk is written, so a malformed one raises
+    ValueError with nothing imported; the file is read twice for that
+    rather than held in memory.
+    """
+    for i, record in enumerate(read_records(path), 1):
+        to_task_data(record, i)
+    rows = (to_task_data(record, i) for i, record in enumerate(read_records(path), 1))
+    return db.add_tasks(rows, chunk_size)
@@ -0,0 +1,182 @@
+import marshal
+import os
+import struct
+import threading
+import zlib
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FILE = "snapshot.bin"
+JOURNAL_FILE = "journal.log"
+# While a snapshot is being written the journal it covers is kept here
+COMPACTING_FILE = "journal.compacting"
+
+# Journal record frame: payload length and CRC32, then the marshal payload
+_FRAME = struct.Struct("<II")
+
+
+def write_snapshot(directory, next_id, settings, rows):
+    """Write a compacted copy of the store; rows are plain tuples.
+
+    The file is written beside the old one and renamed over it, so a crash
+    leaves either the previous snapshot or the new one, never half of it.
+    """
+    path = os.path.join(directory, SNAPSHOT_FILE)
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        marshal.dump((SNAPSHOT_VERSION, next_id, settings, rows), f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+    _fsync_directory(directory)
+
+
+def read_snapshot(directory):
+    """(next_id, settings, rows), or None when there is no snapshot yet"""
+    try:
+        with open(os.path.join(directory, SNAPSHOT_FILE), "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    # loads() on the whole file is ~20x faster than load() on the file,
+    # which reads it a few bytes at a time
+    version, next_id, settings, rows = marshal.loads(data)
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}")
+    return next_id, settings, rows
+
+
+def read_journal(path):
+    """Return the journal's records, dropping a torn or corrupt tail.
+
+    The file is truncated after the last good record so new appends never
+    follow garbage.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return []
+    records = []
+    offset = 0
+    # Replay time is dominated by this loop: slice a memoryview instead of
+    # copying each payload, and look the helpers up once
+    view = memoryview(data)
+    end = len(data) - _FRAME.size
+    unpack_from, crc32, loads, append = _FRAME.unpack_from, zlib.crc32, marshal.loads, records.append
+    while offset <= end:
+        length, checksum = unpack_from(view, offset)
+        start = offset + _FRAME.size
+        payload = view[start:start + length]
+        if len(payload) < length or crc32(payload) != checksum:
+            break
+        append(loads(payload))
+        offset = start + length
+    view.release()
+    if offset < len(data):
+        print(f"Journal {path}: dropped {len(data) - offset} bytes of incomplete records")
+        with open(path, "r+b") as f:
+            f.truncate(offset)
+    return records
+
+
+def _fsync_directory(directory):
+    # Makes renames and new files durable; not possible on Windows
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# Append-only log of store mutations with group commit
+class TaskJournal:
+    """Appends are buffered writes, a few microseconds each.
+
+    A background thread flushes and fsyncs whatever was appended every
+    fsync_interval seconds, so one fsync covers every write in that window
+    (a crash loses at most that window). Records are absolute ("task 7 is
+    now ...", "task 7 is gone"), so replaying one that a snapshot already
+    contains is harmless.
+    """
+    def __init__(self, directory, fsync_interval=0.05):
+        self.directory = directory
+        self.path = os.path.join(directory, JOURNAL_FILE)
+        self.fsync_interval = fsync_interval
+        self.records = 0
+        self._file = open(self.path, "ab")
+        self._dirty = False
+        self._lock = threading.Lock()
+        # Held by sync/rotate/close so the file is never swapped mid-fsync
+        self._sync_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._sync_loop, name="task-journal", daemon=True)
+        self._thread.start()
+
+    def append(self, record):
+        payload = marshal.dumps(record)
+        frame = _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            self._file.write(frame)
+            self._dirty = True
+            self.records += 1
+
+    def sync(self):
+        """Flush and fsync everything appended so far"""
+        with self._sync_lock:
+            with self._lock:
+                if not self._dirty or self._file.closed:
+                    return
+                self._file.flush()
+                self._dirty = False
+            os.fsync(self._file.fileno())
+
+    def rotate(self):
+        """Move the current journal aside for compaction and start a new one.
+
+        If an earlier snapshot failed its journal is still waiting, so the
+        current one is appended to it rather than replacing it.
+        """
+        compacting = os.path.join(self.directory, COMPACTING_FILE)
+        with self._sync_lock:
+            with self._lock:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+                if os.path.exists(compacting):
+                    with open(self.path, "rb") as current, open(compacting, "ab") as waiting:
+                        waiting.write(current.read())
+                        waiting.flush()
+                        os.fsync(waiting.fileno())
+                    os.remove(self.path)
+                else:
+                    os.replace(self.path, compacting)
+                self._file = open(self.path, "ab")
+                self._dirty = False
+                self.records = 0
+            _fsync_directory(self.directory)
+
+    def compacted(self):
+        """Drop the rotated journal once the snapshot covering it is durable"""
+        try:
+            os.remove(os.path.join(self.directory, COMPACTING_FILE))
+        except FileNotFoundError:
+            pass
+
+    def _sync_loop(self):
+        while not self._stopped.wait(self.fsync_interval):
+            try:
+                self.sync()
+            except (OSError, ValueError) as e:
+                print(f"Journal sync error: {e}")
+
+    def close(self):
+        self._stopped.set()
+        self._thread.join()
+        self.sync()
+        with self._sync_lock, self._lock:
+            self._file.close()
@@ -2,9 +2,12 @@ import sys
 from PyQt5.QtWidgets import QApplication, QMessageBox
 from PyQt5.QtCore import Qt, QDate, QTime
 from database_handler import DatabaseHandler
+from search_index import SearchIndex, tokenize
+import task_import
+from settings_cache import SettingsCache
 
 class SmartTaskManager:
-    def __init__(self):
+    def __init__(self, search_mode="fulltext"):
         # Initialize MySQL connection
         self.db = DatabaseHandler(
             host="localhost",
@@ -13,6 +16,15 @@ class SmartTaskManager:
             database="task_manager"
         )
         self.db.create_tables()
+        # All settings in one query; writes are batched behind the cache
+        self.settings = SettingsCache(self.db, {"pomodoro_work": 25, "pomodoro_break": 5})
+        self.settings.load()
+        # "fulltext": relevance-ranked MATCH ... AGAINST on the server;
+        # "index": in-process SearchIndex kept in sync by this manager
+        self.search_mode = search_mode
+        self.search_index = None
+        if search_mode == "index":
+            self.build_search_index()
 
     # --- Task Management ---
     def add_task(self, title, description, due_date, due_time, priority, 
@@ -23,6 +35,8 @@ class SmartTaskManager:
             category, recurrence, attachment_path
         )
         task_id = self.db.add_task(task_data)
+        if task_id is not None and self.search_index is not None:
+            self.search_index.add(task_id, title, description, category)
         if status == "Completed":
             self.db.execute_query(
                 "INSERT INTO TaskHistory (task_id, completion_date) VALUES (%s, NOW())",
@@ -39,21 +53,151 @@ class SmartTaskManager:
         set_clause = ", ".join([f"{k}=%s" for k in updates.keys()])
         query = f"UPDATE Tasks SET {set_clause} WHERE id=%s"
         self.db.execute_query(query, (*updates.values(), task_id))
+        self.db.invalidate_stats()
+        if self.search_index is not None and {'title', 'description', 'category'} & updates.keys():
+            self._reindex_task(task_id)
 
     def delete_task(self, task_id):
         self.db.delete_task(task_id)
+        if self.search_index is not None:
+            self.search_index.remove(task_id)
 
-    def search_tasks(self, search_term):
-        query = """
-            SELECT id, title, due_date, priority, status, category 
-            FROM Tasks 
-            WHERE title LIKE %s OR description LIKE %s OR category LIKE %s
+    def import_tasks(self, path, chunk_size=1000):
+        """Bulk import tasks from a CSV/JSON file; returns the row count"""
+        rows = self.db.execute_query("SELECT COALESCE(MAX(id), 0) FROM Tasks", fetch=True)
+        last_id = rows[0][0] if rows else 0
+        try:
+            return task_import.import_tasks(self.db, path, chunk_size)
+        finally:
+            # Runs even if the import stopped partway, so chunks that were
+            # committed still get their history rows and index entries
+            self._after_import(last_id)
+
+    def _after_import(self, last_id):
+        # One statement records history for every imported completed task,
+        # and the new rows are added to the search index in one pass
+        self.db.execute_query(
+            """
+            INSERT INTO TaskHistory (task_id, completion_date)
+            SELECT t.id, NOW() FROM Tasks t
+            LEFT JOIN TaskHistory h ON h.task_id = t.id
+            WHERE t.id > %s AND t.status = 'Completed' AND h.id IS NULL
+            """,
+            (last_id,)
+        )
+        if self.search_index is not None:
+            rows = self.db.execute_query(
+                "SELECT id, title, description, category FROM Tasks WHERE id > %s",
+                (last_id,), fetch=True
+            )
+            for task_id, title, description, category in rows or []:
+                self.search_index.add(task_id, title, description, category)
+
+    # --- Search ---
+    def build_search_index(self):
+        self.search_index = SearchIndex()
+        rows = self.db.execute_query(
+            "SELECT id, title, description, category FROM Tasks", fetch=True
+        )
+        for task_id, title, description, category in rows or []:
+            self.search_index.add(task_id, title, description, category)
+
+    def _reindex_task(self, task_id):
+        rows = self.db.execute_query(
+            "SELECT title, description, category FROM Tasks WHERE id=%s",
+            (task_id,), fetch=True
+        )
+        if rows:
+            self.search_index.update(task_id, *rows[0])
+        else:
+            self.search_index.remove(task_id)
+
+    def search_tasks(self, search_term, batch_size=1000):
+        if self.search_index is None:
+            return self.search_tasks_fulltext(search_term)
+        task_ids = self.search_index.search(search_term)
+        if task_ids is None:
+            return self.db.get_tasks()
+
+        # Fetch the matching rows by primary key
+        results = []
+        task_ids = sorted(task_ids)
+        for start in range(0, len(task_ids), batch_size):
+            batch = task_ids[start:start + batch_size]
+            placeholders = ", ".join(["%s"] * len(batch))
+            rows = self.db.execute_query(
+                f"""
+                SELECT id, title, due_date, priority, status, category
+                FROM Tasks
+                WHERE id IN ({placeholders})
+                ORDER BY id
+                """,
+                batch, fetch=True
+            )
+            results.extend(rows or [])
+        return results
+
+    def search_tasks_fulltext(self, search_term):
+        """Relevance-ranked search using the FULLTEXT index on title and
+        description, with SearchIndex's rules: every word has to start a
+        word of the title, the description or the category. A blank query
+        returns every task, one with no words (only punctuation) none.
+
+        Category-only matches follow the text matches. The text side is
+        still the server's full-text parser, so unlike SearchIndex it does
+        not find stopwords or words shorter than innodb_ft_min_token_size
+        (3 by default) on their own, only as prefixes of longer words.
         """
-        return self.db.execute_query(
-            query, 
-            (f"%{search_term}%", f"%{search_term}%", f"%{search_term}%"), 
+        if not search_term or search_term.isspace():
+            return self.db.get_tasks()
+        words = list(dict.fromkeys(tokenize(search_term)))
+        if not words:
+            return []
+        # Categories are few, so which words each one matches is worked out
+        # here; its tasks then only need their other words in the text
+        rows = self.db.execute_query("SELECT DISTINCT category FROM Tasks", fetch=True)
+        categories_by_words = {}
+        for (category,) in rows or []:
+            category_words = tokenize(category)
+            matched = frozenset(word for word in words
+                                if any(token.startswith(word) for token in category_words))
+            if matched:
+                categories_by_words.setdefault(matched, []).append(category)
+        
+        # Every branch is ranked by the text against all the words, so
+        # category-only matches score 0
+        match = "MATCH(title, description) AGAINST (%s IN BOOLEAN MODE)"
+        ranking_query = " ".join(f"{word}*" for word in words)
+        
+        def select(text_words, category_condition, category_params):
+            conditions, params = [category_condition], [ranking_query, *category_params]
+            if text_words:
+                conditions.insert(0, match)
+                params.insert(1, " ".join(f"+{word}*" for word in text_words))
+            return (f"""
+            SELECT id, title, due_date, priority, status, category, {match} AS relevance
+            FROM Tasks
+            WHERE {" AND ".join(conditions)}""", params)
+        
+        # Tasks whose category matches no word need every word in the text
+        matched_categories = [category for categories in categories_by_words.values()
+                              for category in categories]
+        category_condition = "TRUE"
+        if matched_categories:
+            placeholders = ", ".join(["%s"] * len(matched_categories))
+            category_condition = f"(category IS NULL OR category NOT IN ({placeholders}))"
+        selects = [select(words, category_condition, matched_categories)]
+        for matched, categories in categories_by_words.items():
+            placeholders = ", ".join(["%s"] * len(categories))
+            selects.append(select([word for word in words if word not in matched],
+                                  f"category IN ({placeholders})", categories))
+        rows = self.db.execute_query(
+            "\n            UNION ALL".join(query for query, _ in selects)
+            + "\n            ORDER BY relevance DESC, id\n            ",
+            [param for _, params in selects for param in params],
             fetch=True
         )
+        return [row[:6] for row in rows or []]
 
     # --- Dashboard ---
     def get_productivity_stats(self):
@@ -73,17 +217,18 @@ class SmartTaskManager:
 
     # --- Settings ---
     def update_pomodoro_settings(self, work_duration, break_duration):
-        self.db.save_setting("pomodoro_work", str(work_duration))
-        self.db.save_setting("pomodoro_break", str(break_duration))
+        self.settings.set("pomodoro_work", work_duration)
+        self.settings.set("pomodoro_break", break_duration)
 
     def get_pomodoro_settings(self):
         return {
-            'work': int(self.db.get_setting("pomodoro_work") or 25),
-            'break': int(self.db.get_setting("pomodoro_break") or 5)
+            'work': self.settings.get_int("pomodoro_work", 25),
+            'break': self.settings.get_int("pomodoro_break", 5)
         }
 
     # --- Utility ---
     def close(self):
+        self.settings.close()
         self.db.disconnect()
 
 if __name__ == "__main__":
@@ -0,0 +1,648 @@
+import gc
+import os
+import sys
+import threading
+from array import array
+from bisect import bisect_left, insort
+from collections import ChainMap, Counter, namedtuple
+from datetime import date
+from functools import partial
+from itertools import compress, repeat
+from operator import eq, itemgetter
+
+from search_index import SearchIndex
+from task_journal import COMPACTING_FILE, JOURNAL_FILE, TaskJournal, read_journal, read_snapshot, write_snapshot
+
+# Column layout of a task row, shared by TaskCard and the task filters
+TASK_FIELDS = (
+    "id", "title", "due_date", "priority", "category",
+    "state", "status", "description", "start_date", "end_date"
+)
+
+# Columns with a small set of repeated values; interning them means every
+# task with the same priority, status or due date shares one string object
+_INTERNED_FIELDS = (2, 3, 4, 5, 6, 8, 9)
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+# Secondary indexes hold task ids in sorted arrays: 8 bytes per entry,
+# where a dict used as an ordered set cost ~50. _NO_IDS stands in for a
+# value no task has (a tuple would read as a due-date range in _query).
+_NO_IDS = array("q")
+
+
+def _add_id(ids, task_id):
+    # New tasks get the highest id, so this is almost always an append
+    if not ids or ids[-1] < task_id:
+        ids.append(task_id)
+    else:
+        insort(ids, task_id)
+
+
+def _bulk_indexes(tasks):
+    """Secondary indexes for tasks given in ascending id order: (by_status,
+    by_priority, by_category, by_due, pending_due_counts). Built with a few
+    C-level passes per field (map, compress, a keyed sort) instead of one
+    Python call per task."""
+    ids = array("q", map(itemgetter(0), tasks))
+    value_indexes = []
+    for field in (6, 3, 4):
+        values = list(map(itemgetter(field), tasks))
+        value_indexes.append({value: array("q", compress(ids, map(eq, repeat(value), values)))
+                              for value in set(values)})
+    due_dates = [due_date or "" for due_date in map(itemgetter(2), tasks)]
+    # sorted() is stable, so tasks due the same day stay in id order
+    order = sorted(range(len(due_dates)), key=due_dates.__getitem__)
+    by_due = array("q", map(ids.__getitem__, order))
+    pending = map(eq, repeat("Pending"), map(itemgetter(6), tasks))
+    pending_due_counts = dict(Counter(filter(None, compress(due_dates, pending))))
+    return (*value_indexes, by_due, pending_due_counts)
+
+
+def _wait(event, cancelled):
+    # Wait for a background index build; False if cancelled first
+    while not event.wait(None if cancelled is None else 0.05):
+        if cancelled():
+            return False
+    return True
+
+
+def _remove_id(ids, task_id):
+    i = bisect_left(ids, task_id)
+    if i < len(ids) and ids[i] == task_id:
+        del ids[i]
+
+
+class Task(namedtuple("Task", TASK_FIELDS)):
+    """Immutable task record.
+
+    Behaves like the old 10-element row (task[1] is the title, task[6] the
+    display status, ...) but is a tuple without a per-instance dict, so it
+    can be handed out to the UI as-is instead of being copied.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_data(cls, task_id, task_data):
+        row = [task_id] + list(task_data)
+        for i in _INTERNED_FIELDS:
+            row[i] = _intern(row[i])
+        return cls._make(row)
+
+
+# In-memory Database Handler with working CRUD operations
+class DatabaseHandler:
+    def __init__(self, host=None, user=None, password=None, database=None, data_dir=None,
+                 snapshot_every=100000, fsync_interval=0.05, demo_tasks=True):
+        # In-memory storage; with data_dir set, every change is also
+        # journaled there and the store is recovered from it on startup
+        # Tasks are keyed by id; dicts keep insertion order, so get_tasks still
+        # lists tasks in the order they were added while lookups stay O(1)
+        self.tasks = {}
+        self._snapshot = None
+        # Guards the tasks and indexes against background readers (the
+        # search pipeline queries from a worker thread)
+        self._lock = threading.RLock()
+        # Secondary indexes: value -> sorted array of task ids, and the ids
+        # ordered by (due_date, task_id) for range scans and keyset paging;
+        # tasks without a due date sort first under ""
+        self._by_status = {}
+        self._by_priority = {}
+        self._by_category = {}
+        self._by_due = array("q")
+        # The store still has a task's text when it changes, so the search
+        # index need not keep a copy of each task's tokens
+        self._search = SearchIndex(keep_tokens=False)
+        # Pending tasks per due date and the number of them due before
+        # _overdue_boundary (today), so the dashboard never rescans
+        self._pending_due_counts = {}
+        self._overdue_boundary = date.today().strftime("%Y-%m-%d")
+        self._overdue_count = 0
+        # A recovered store is loaded without indexes and builds them on
+        # the task-indexer thread (search last, it is the slowest). Readers
+        # wait for the ready events outside the lock; changes made during
+        # the build are kept in _index_backlog as (added, task) and
+        # replayed onto the new indexes before they go live
+        self._indexed = True
+        self._search_indexed = True
+        self._indexes_ready = threading.Event()
+        self._indexes_ready.set()
+        self._search_ready = threading.Event()
+        self._search_ready.set()
+        self._index_backlog = None
+        self._indexer = None
+        self.settings = {
+            'work_duration': '25',
+            'break_duration': '5',
+            'long_break_duration': '15'
+        }
+        self.next_id = 1
+        # Persistence: append-only journal plus periodic snapshots
+        self.data_dir = data_dir
+        self.snapshot_every = snapshot_every
+        self._journal = None
+        self._compactor = None
+        
+        if data_dir is not None:
+            os.makedirs(data_dir, exist_ok=True)
+            if self._recover(data_dir):
+                self._journal = TaskJournal(data_dir, fsync_interval)
+                self._start_indexer()
+                return
+        # A new store starts with a few demo tasks unless demo_tasks is off
+        if demo_tasks:
+            for task in [
+                [1, "Complete project proposal", "2024-02-15", "High", "Work", "pending", "Pending", "Important project deadline", "2024-02-10", "2024-02-15"],
+                [2, "Review code changes", "2024-02-12", "Medium", "Development", "pending", "Pending", "Code review for new features", "2024-02-11", "2024-02-12"],
+                [3, "Team meeting", "2024-02-13", "High", "Meeting", "completed", "Completed", "Weekly team sync", "2024-02-13", "2024-02-13"],
+                [4, "Update documentation", "2024-02-14", "Low", "Documentation", "pending", "Pending", "Update user manual", "2024-02-14", "2024-02-14"],
+                [5, "Prepare presentation", "2024-02-16", "High", "Work", "pending", "Pending", "Quarterly review presentation", "2024-02-15", "2024-02-16"],
+            ]:
+                self._insert(Task.from_data(task[0], task[1:]))
+            self.next_id = 6
+        if data_dir is not None:
+            # A new data directory starts from a snapshot of its first tasks
+            self._journal = TaskJournal(data_dir, fsync_interval)
+            self.compact(wait=True)
+    
+    def connect(self):
+        return True
+    
+    def close(self):
+        """Finish any compaction, snapshot the journal's changes so the next
+        start reads a single file, and close the journal"""
+        if self._journal is None:
+            return
+        if self._compactor is not None:
+            self._compactor.join()
+        if self._journal.records:
+            self.compact(wait=True)
+        self._journal.close()
+        self._journal = None
+    
+    def create_tables(self):
+        return True
+    
+    def get_tasks(self, condition=None, params=None):
+        # Read-only view of all tasks. Records are immutable, so the same
+        # tuple is handed out until the next add/update/delete.
+        # Read once: a writer may reset the attribute at any moment
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot = tuple(self.tasks.values())
+        return snapshot
+    
+    def get_task_by_id(self, task_id):
+        return self.tasks.get(task_id)
+    
+    def add_task(self, task_data):
+        """Returns the new task's id (truthy), or False on error"""
+        try:
+            with self._lock:
+                task_id = self.next_id
+                task = Task.from_data(task_id, task_data)
+                self._log("a", task_id, tuple(task_data))
+                self._insert(task)
+                self.next_id += 1
+                self._compact_if_due()
+            return task_id
+        except Exception as e:
+            print(f"Error adding task: {e}")
+            return False
+    
+    def update_task(self, task_id, task_data):
+        try:
+            new_task = Task.from_data(task_id, task_data)
+            with self._lock:
+                old_task = self.tasks.get(task_id)
+                if old_task is None:
+                    return False
+                self._log("u", task_id, tuple(task_data))
+                # Keep the ID and update the rest; reassigning an existing key
+                # keeps the task in its original position
+                self._unindex(old_task)
+                self.tasks[task_id] = new_task
+                self._index(new_task)
+                self._snapshot = None
+                self._compact_if_due()
+            return True
+        except Exception as e:
+            print(f"Error updating task: {e}")
+            return False
+    
+    def delete_task(self, task_id):
+        try:
+            with self._lock:
+                task = self.tasks.get(task_id)
+                if task is None:
+                    return False
+                self._log("d", task_id)
+                # Unindexed first: the due-date index looks tasks up by id
+                self._unindex(task)
+                del self.tasks[task_id]
+                self._snapshot = None
+                self._compact_if_due()
+            return True
+        except Exception as e:
+            print(f"Error deleting task: {e}")
+            return False
+    
+    def get_stats(self):
+        """Task counts for the dashboard, read from counters kept up to date
+        on every mutation."""
+        self._indexes_ready.wait()
+        with self._lock:
+            today = date.today().strftime("%Y-%m-%d")
+            if today != self._overdue_boundary:
+                # The day rolled over: recount against the new boundary
+                # (once per day, over distinct due dates only)
+                self._overdue_boundary = today
+                self._overdue_count = sum(
+                    count for due_date, count in self._pending_due_counts.items()
+                    if due_date < today
+                )
+            return {
+                'total': len(self.tasks),
+                'by_status': {value: len(ids) for value, ids in self._by_status.items()},
+                'by_priority': {value: len(ids) for value, ids in self._by_priority.items()},
+                'by_category': {value: len(ids) for value, ids in self._by_category.items()},
+                'overdue': self._overdue_count
+            }
+    
+    def get_tasks_page(self, page_size=100, after=None):
+        """Keyset page of tasks ordered by (due_date, id).
+
+        after is the last task of the previous page (None for the first
+        page); the page starts right after its position in the due-date
+        index, so fetching a page never depends on how deep it is.
+        """
+        self._indexes_ready.wait()
+        with self._lock:
+            start = 0
+            if after is not None:
+                start = self._due_position((after[2] or "", after[0]), right=True)
+            return [self.tasks[task_id] for task_id in self._by_due[start:start + page_size]]
+    
+    def iter_tasks(self, batch_size=1000):
+        """Iterate over all tasks in insertion order"""
+        return iter(self.get_tasks())
+    
+    def search_tasks(self, search_text):
+        return self.query_tasks(search=search_text)
+    
+    def query_tasks(self, status=None, priority=None, category=None,
+                    due_before=None, due_on=None, search=None, cancelled=None):
+        """Return tasks matching every given criterion, in insertion order.
+
+        Dates are 'yyyy-MM-dd' strings; every word of search has to match
+        the start of a word in the title, description or category (so
+        "proj rev" finds "Project review" but "view" does not). The
+        smallest matching index is scanned and the rest are checked per
+        task, so the cost follows the size of the result rather than the
+        size of the table.
+
+        cancelled is an optional callable polled while waiting for indexes
+        still being built after recovery, between index lookups, before
+        sorting a due-date range and while scanning; once it returns True
+        the query stops and returns None.
+        """
+        if not _wait(self._indexes_ready, cancelled):
+            return None
+        if search and not _wait(self._search_ready, cancelled):
+            return None
+        with self._lock:
+            return self._query(status, priority, category, due_before,
+                               due_on, search, cancelled)
+    
+    def _query(self, status, priority, category, due_before, due_on,
+               search, cancelled):
+        # Each candidate is (size, ids); due-date ranges are only sliced
+        # out of the sorted index once they turn out to be the smallest
+        candidates = []
+        for index, value in ((self._by_status, status),
+                             (self._by_priority, priority),
+                             (self._by_category, category)):
+            if value is not None:
+                ids = index.get(value, _NO_IDS)
+                candidates.append((len(ids), ids))
+        if due_before is not None:
+            lo = self._due_position(("", float('inf')))
+            hi = self._due_position((due_before, float('-inf')))
+            candidates.append((max(hi - lo, 0), (lo, hi)))
+        if due_on is not None:
+            lo = self._due_position((due_on, float('-inf')))
+            hi = self._due_position((due_on, float('inf')))
+            candidates.append((hi - lo, (lo, hi)))
+        search_ids = self._search.search(search, cancelled) if search else None
+        if cancelled is not None and cancelled():
+            return None
+        if search_ids is not None:
+            candidates.append((len(search_ids), search_ids))
+        if not candidates:
+            return list(self.get_tasks())
+        
+        _, smallest = min(candidates, key=lambda candidate: candidate[0])
+        if isinstance(smallest, tuple):
+            lo, hi = smallest
+            if cancelled is not None and cancelled():
+                return None
+            ids = sorted(self._by_due[lo:hi])
+        else:
+            # Index arrays and search results are already in id (insertion) order
+            ids = smallest
+        if len(candidates) == 1:
+            # A single criterion selects exactly its matches: nothing to recheck
+            return list(map(self.tasks.__getitem__, ids))
+        if search_ids is not None and smallest is not search_ids:
+            search_ids = set(search_ids)
+        
+        result = []
+        for count, task_id in enumerate(ids):
+            if cancelled is not None and count % 1024 == 0 and cancelled():
+                return None
+            task = self.tasks[task_id]
+            if status is not None and task.status != status:
+                continue
+            if priority is not None and task.priority != priority:
+                continue
+            if category is not None and task.category != category:
+                continue
+            if due_before is not None and not (task.due_date and task.due_date < due_before):
+                continue
+            if due_on is not None and task.due_date != due_on:
+                continue
+            if search_ids is not None and task_id not in search_ids:
+                continue
+            result.append(task)
+        return result
+    
+    def _insert(self, task):
+        self.tasks[task.id] = task
+        self._index(task)
+        self._snapshot = None
+    
+    def _index(self, task):
+        if self._indexed:
+            self._index_values(task)
+        if self._search_indexed:
+            self._search.add(task.id, task.title, task.description, task.category)
+        if self._index_backlog is not None:
+            self._index_backlog.append((True, task))
+    
+    def _index_values(self, task, tasks=None):
+        for index, value in ((self._by_status, task.status),
+                             (self._by_priority, task.priority),
+                             (self._by_category, task.category)):
+            ids = index.get(value)
+            if ids is None:
+                ids = index[value] = array("q")
+            _add_id(ids, task.id)
+        if task.due_date and task.status == "Pending":
+            self._pending_due_counts[task.due_date] = self._pending_due_counts.get(task.due_date, 0) + 1
+            if task.due_date < self._overdue_boundary:
+                self._overdue_count += 1
+        self._by_due.insert(self._due_position((task.due_date or "", task.id), tasks=tasks), task.id)
+    
+    def _due_position(self, key, right=False, tasks=None):
+        """Where key, a (due_date, task_id) pair, falls in _by_due; the
+        equivalent of bisect_left (or bisect_right) over a list of such
+        pairs, with each entry's due date read from its task (in tasks,
+        by default the store's)"""
+        by_due = self._by_due
+        if tasks is None:
+            tasks = self.tasks
+        lo, hi = 0, len(by_due)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            task_id = by_due[mid]
+            entry = (tasks[task_id].due_date or "", task_id)
+            if entry < key or (right and entry == key):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+    
+    def _unindex(self, task):
+        if self._search_indexed:
+            self._search.remove(task.id, task.title, task.description, task.category)
+        if self._indexed:
+            self._unindex_values(task)
+        if self._index_backlog is not None:
+            self._index_backlog.append((False, task))
+    
+    def _unindex_values(self, task, tasks=None):
+        for index, value in ((self._by_status, task.status),
+                             (self._by_priority, task.priority),
+                             (self._by_category, task.category)):
+            ids = index.get(value)
+            if ids is not None:
+                _remove_id(ids, task.id)
+                if not ids:
+                    del index[value]
+        i = self._due_position((task.due_date or "", task.id), tasks=tasks)
+        if i < len(self._by_due) and self._by_due[i] == task.id:
+            del self._by_due[i]
+        if task.due_date and task.status == "Pending":
+            remaining = self._pending_due_counts[task.due_date] - 1
+            if remaining:
+                self._pending_due_counts[task.due_date] = remaining
+            else:
+                del self._pending_due_counts[task.due_date]
+            if task.due_date < self._overdue_boundary:
+                self._overdue_count -= 1
+    
+    # --- Persistence ---
+    def _log(self, *record):
+        # Called with the lock held, so journal order is mutation order, and
+        # before the change is applied: if the append fails the store is
+        # left as it was rather than ahead of its journal
+        if self._journal is not None:
+            self._journal.append(record)
+    
+    def _compact_if_due(self):
+        # Called once the logged change is applied, so the snapshot holds it
+        if self._journal is None or self._journal.records < self.snapshot_every:
+            return
+        try:
+            self.compact()
+        except (OSError, ValueError) as e:
+            # The change is journaled; compaction is retried on the next one
+            print(f"Compaction error: {e}")
+    
+    def _recover(self, data_dir):
+        """Load the latest snapshot and replay the journal(s) after it.
+        Returns False when the directory holds no data yet."""
+        # Loading creates millions of tuples at once; collections triggered
+        # by that would only scan them again, so GC is paused meanwhile
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            snapshot = read_snapshot(data_dir)
+            # A journal still waiting for its snapshot comes before the current one
+            records = (read_journal(os.path.join(data_dir, COMPACTING_FILE))
+                       + read_journal(os.path.join(data_dir, JOURNAL_FILE)))
+            if snapshot is None and not records:
+                return False
+            
+            self._indexed = False
+            self._search_indexed = False
+            if snapshot is not None:
+                next_id, settings, rows = snapshot
+                self.next_id = next_id
+                self.settings.update(settings)
+                # Rows come back with their strings already interned, so they
+                # are wrapped as-is (tuple.__new__ skips _make's overhead)
+                self.tasks = dict(zip([row[0] for row in rows],
+                                      map(partial(tuple.__new__, Task), rows)))
+            # Records hold absolute values, so replaying is plain assignment
+            for record in records:
+                kind = record[0]
+                if kind == "a" or kind == "u":
+                    self.tasks[record[1]] = Task.from_data(record[1], record[2])
+                    self.next_id = max(self.next_id, record[1] + 1)
+                elif kind == "d":
+                    self.tasks.pop(record[1], None)
+                elif kind == "s":
+                    self.settings[record[1]] = record[2]
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self._snapshot = None
+        return True
+    
+    def _start_indexer(self):
+        # The recovered tasks are captured before any change can be made,
+        # so every later change lands in the backlog
+        self._indexes_ready.clear()
+        self._search_ready.clear()
+        self._index_backlog = []
+        self._indexer = threading.Thread(target=self._build_indexes,
+                                         args=(list(self.tasks.values()),),
+                                         name="task-indexer", daemon=True)
+        self._indexer.start()
+    
+    def _build_indexes(self, tasks):
+        """Runs on the task-indexer thread: build the indexes for tasks
+        without holding the lock, then, under it, replay the backlog onto
+        them and swap them in. The search index follows the same way."""
+        try:
+            tasks.sort(key=itemgetter(0))
+            indexes = _bulk_indexes(tasks)
+            with self._lock:
+                self._swap_indexes(*indexes)
+                tasks = list(self.tasks.values())
+            self._indexes_ready.set()
+            
+            search = SearchIndex(keep_tokens=False)
+            for task in tasks:
+                search.add(task.id, task.title, task.description, task.category)
+            with self._lock:
+                for added, task in self._index_backlog:
+                    if added:
+                        search.add(task.id, task.title, task.description, task.category)
+                    else:
+                        search.remove(task.id, task.title, task.description, task.category)
+                self._search = search
+                self._search_indexed = True
+                self._index_backlog = None
+        except Exception as e:
+            print(f"Index build error: {e}; indexing task by task")
+            with self._lock:
+                self._reindex()
+        finally:
+            self._indexes_ready.set()
+            self._search_ready.set()
+    
+    def _swap_indexes(self, by_status, by_priority, by_category, by_due, pending_due_counts):
+        # Called with the lock held. The built due-date index is ordered by
+        # the tasks as they were captured; each backlog entry is applied
+        # against the versions current at that point of the replay (tasks
+        # the backlog never touches are still the captured ones)
+        self._by_status, self._by_priority, self._by_category = by_status, by_priority, by_category
+        self._by_due = by_due
+        self._pending_due_counts = pending_due_counts
+        self._overdue_count = sum(count for due_date, count in pending_due_counts.items()
+                                  if due_date < self._overdue_boundary)
+        versions = {}
+        for added, task in self._index_backlog:
+            versions.setdefault(task.id, None if added else task)
+        tasks = ChainMap(versions, self.tasks)
+        for added, task in self._index_backlog:
+            if added:
+                self._index_values(task, tasks)
+                versions[task.id] = task
+            else:
+                self._unindex_values(task, tasks)
+                versions[task.id] = None
+        self._indexed = True
+        # From here on the backlog only collects changes for the search index
+        self._index_backlog = []
+    
+    def _reindex(self):
+        # Slow fallback, with the lock held: index every task one by one
+        self._by_status, self._by_priority, self._by_category = {}, {}, {}
+        self._by_due = array("q")
+        self._pending_due_counts = {}
+        self._overdue_count = 0
+        self._search = SearchIndex(keep_tokens=False)
+        self._indexed = self._search_indexed = True
+        self._index_backlog = None
+        for task in self.tasks.values():
+            self._index(task)
+    
+    def compact(self, wait=False):
+        """Snapshot the store and start a new journal.
+
+        The journal is switched and the state captured under the lock (tasks
+        are immutable, so copying the references is enough); the snapshot
+        itself is written on a background thread unless wait is set.
+        """
+        if self._journal is None:
+            return
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            self._journal.rotate()
+            rows = list(self.tasks.values())
+            settings = dict(self.settings)
+            next_id = self.next_id
+            if wait:
+                self._write_snapshot(next_id, settings, rows)
+                return
+            self._compactor = threading.Thread(target=self._write_snapshot,
+                                               args=(next_id, settings, rows),
+                                               name="task-snapshot")
+            self._compactor.start()
+    
+    def _write_snapshot(self, next_id, settings, rows):
+        try:
+            write_snapshot(self.data_dir, next_id, settings, [tuple(task) for task in rows])
+            self._journal.compacted()
+        except (OSError, ValueError) as e:
+            # The rotated journal is kept, so nothing is lost
+            print(f"Snapshot error: {e}")
+    
+    def get_setting(self, setting_name):
+        return self.settings.get(setting_name, '25')
+    
+    def update_setting(self, setting_name, value):
+        with self._lock:
+            self._log("s", setting_name, value)
+            self.settings[setting_name] = value
+            self._compact_if_due()
+        return True
+    
+    def get_all_settings(self):
+        return dict(self.settings)
+    
+    def save_settings(self, settings):
+        with self._lock:
+            for setting_name, value in settings.items():
+                self._log("s", setting_name, value)
+                self.settings[setting_name] = value
+            self._compact_if_due()
+        return True
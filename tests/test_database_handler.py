@@ -0,0 +1,34 @@
+import pytest
+
+pytest.importorskip("mysql.connector")
+
+from database_handler import DatabaseHandler
+
+
+@pytest.fixture
+def handler():
+    # No server: the statements are captured instead of run
+    handler = DatabaseHandler.__new__(DatabaseHandler)
+    handler.calls = []
+
+    def execute_many(query, rows, chunk_size=1000):
+        rows = list(rows)
+        handler.calls.append((" ".join(query.split()), rows))
+        return len(rows)
+
+    handler.execute_many = execute_many
+    return handler
+
+
+def test_save_settings_upserts_in_one_statement(handler):
+    assert handler.save_settings({'work_duration': '30', 'break_duration': '10'})
+    [(query, rows)] = handler.calls
+    assert rows == [('work_duration', '30'), ('break_duration', '10')]
+    assert query == ("INSERT INTO UserSettings (setting_name, setting_value) VALUES (%s, %s) "
+                     "ON DUPLICATE KEY UPDATE setting_value=VALUES(setting_value)")
+
+
+def test_save_settings_upsert_runs_on_mariadb(handler):
+    # The row-alias form (VALUES (...) AS new) is a syntax error there
+    handler.save_settings({'work_duration': '30'})
+    assert " AS new" not in handler.calls[0][0]
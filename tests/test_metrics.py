@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+import metrics
+from metrics import Histogram, MetricsRegistry, statement_tag
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry(slow_query_threshold=None)
+
+
+def test_statement_tag():
+    assert statement_tag("SELECT id FROM Tasks WHERE id=%s") == "SELECT Tasks"
+    assert statement_tag("  insert into UserSettings (a) VALUES (1)") == "INSERT UserSettings"
+    assert statement_tag("CREATE TABLE IF NOT EXISTS TaskHistory (id INT)") == "CREATE TaskHistory"
+    assert statement_tag("PRAGMA journal_mode=WAL") == "OTHER"
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram()
+    for seconds in (0.0001, 0.0002, 0.003, 0.2):
+        histogram.observe(seconds)
+    assert histogram.count == 4
+    assert histogram.total == pytest.approx(0.2033)
+    assert histogram.max == 0.2
+    assert histogram.quantile(0.5) == 0.0005
+    assert histogram.quantile(0.99) == 0.2
+
+
+def test_series_are_capped(registry):
+    registry.max_series = 2
+    for slot in ("a", "b", "c", "d"):
+        registry.observe("gui_slot_seconds", 0.01, (("slot", slot),))
+    series = registry.to_dict()['metrics']['gui_slot_seconds']
+    assert [row['labels'] for row in series] == [{'slot': 'a'}, {'slot': 'b'},
+                                                 {'series': 'other'}]
+    assert series[-1]['count'] == 2
+
+
+def test_queries_are_grouped_by_statement(registry):
+    registry.observe_query("SELECT * FROM Tasks WHERE id=1", 0.001, "sqlite")
+    registry.observe_query("SELECT * FROM Tasks WHERE id=2", 0.002, "sqlite")
+    [series] = registry.to_dict()['metrics']['query_duration_seconds']
+    assert series['labels'] == {'backend': 'sqlite', 'statement': 'SELECT Tasks'}
+    assert series['count'] == 2
+
+
+def test_slow_queries_are_kept(capsys):
+    registry = MetricsRegistry(slow_query_threshold=0.1, slow_query_log_size=1)
+    registry.observe_query("SELECT 1 FROM Tasks", 0.5)
+    registry.observe_query("SELECT  2\n FROM Tasks", 0.3)
+    assert [entry['statement'] for entry in registry.slow_queries] == ["SELECT 2 FROM Tasks"]
+    assert "Slow query" in capsys.readouterr().out
+
+
+def test_prometheus_export(registry):
+    registry.observe("search_seconds", 0.003, (("step", "find_tasks"),))
+    text = registry.to_prometheus()
+    assert "# TYPE search_seconds histogram" in text
+    assert 'search_seconds_bucket{step="find_tasks",le="0.0025"} 0' in text
+    assert 'search_seconds_bucket{step="find_tasks",le="0.005"} 1' in text
+    assert 'search_seconds_bucket{step="find_tasks",le="+Inf"} 1' in text
+    assert 'search_seconds_count{step="find_tasks"} 1' in text
+
+
+def test_export_picks_the_format_from_the_extension(registry, tmp_path):
+    registry.observe("search_seconds", 0.003)
+    registry.export(str(tmp_path / "metrics.json"))
+    registry.export(str(tmp_path / "metrics.prom"))
+    data = json.loads((tmp_path / "metrics.json").read_text())
+    assert data['metrics']['search_seconds'][0]['count'] == 1
+    assert (tmp_path / "metrics.prom").read_text().startswith("# TYPE search_seconds histogram")
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["metrics.json", "metrics.prom"]
+
+
+def test_timed_records_every_call(monkeypatch, registry):
+    monkeypatch.setattr(metrics, "REGISTRY", registry)
+
+    @metrics.timed("gui_slot_seconds", slot="load")
+    def load(fail=False):
+        if fail:
+            raise RuntimeError("boom")
+        return "loaded"
+
+    assert load() == "loaded"
+    with pytest.raises(RuntimeError):
+        load(fail=True)
+    [series] = registry.to_dict()['metrics']['gui_slot_seconds']
+    assert series['labels'] == {'slot': 'load'}
+    assert series['count'] == 2
+
+    registry.enabled = False
+    load()
+    assert registry.to_dict()['metrics']['gui_slot_seconds'][0]['count'] == 2
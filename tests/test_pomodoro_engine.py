@@ -0,0 +1,115 @@
+import pytest
+
+from pomodoro_engine import HIDDEN_INTERVAL, TICK_SLACK, PomodoroEngine
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def engine(clock):
+    return PomodoroEngine(25 * 60, 5 * 60, clock=clock)
+
+
+def test_stopped_engine_does_not_count_down(engine, clock):
+    clock.advance(60)
+    assert not engine.running
+    assert engine.remaining() == 25 * 60
+    assert engine.next_interval() is None
+    assert engine.tick() is None
+
+
+def test_remaining_follows_the_clock(engine, clock):
+    engine.start()
+    clock.advance(10.25)
+    assert engine.remaining() == pytest.approx(25 * 60 - 10.25)
+    assert engine.remaining_seconds() == 25 * 60 - 10
+    assert engine.elapsed() == pytest.approx(10.25)
+
+
+def test_next_interval_wakes_after_the_displayed_second(engine, clock):
+    engine.start()
+    assert engine.next_interval() == 1000 + TICK_SLACK
+    clock.advance(0.25)
+    assert engine.next_interval() == 750 + TICK_SLACK
+
+
+def test_hidden_timer_ticks_rarely_but_not_past_the_end(engine, clock):
+    engine.visible = False
+    engine.start()
+    assert engine.next_interval() == HIDDEN_INTERVAL + TICK_SLACK
+    clock.advance(25 * 60 - 2)
+    assert engine.next_interval() == 2000 + TICK_SLACK
+
+
+def test_pause_and_resume_keep_the_remaining_time(engine, clock):
+    engine.start()
+    clock.advance(100)
+    engine.pause()
+    assert not engine.running
+    clock.advance(500)
+    assert engine.remaining() == pytest.approx(25 * 60 - 100)
+    engine.start()
+    clock.advance(50)
+    assert engine.remaining() == pytest.approx(25 * 60 - 150)
+
+
+def test_work_session_ends_into_a_break(engine, clock):
+    engine.start()
+    clock.advance(25 * 60 - 1)
+    assert engine.tick() is None
+    clock.advance(1)
+    assert engine.tick() == "work"
+    assert not engine.is_work_session
+    assert not engine.running
+    assert engine.remaining() == 5 * 60
+
+
+def test_break_ends_into_work(engine, clock):
+    engine.start()
+    clock.advance(25 * 60)
+    engine.tick()
+    engine.start()
+    clock.advance(5 * 60)
+    assert engine.tick() == "break"
+    assert engine.is_work_session
+    assert engine.remaining() == 25 * 60
+
+
+def test_a_late_tick_catches_up_without_drift(engine, clock):
+    engine.start()
+    clock.advance(25 * 60 + 42)
+    assert engine.remaining() == 0
+    assert engine.tick() == "work"
+
+
+def test_stop_resets_to_a_work_session(engine, clock):
+    engine.start()
+    clock.advance(25 * 60)
+    engine.tick()
+    engine.stop()
+    assert engine.is_work_session
+    assert engine.remaining() == 25 * 60
+
+
+def test_new_durations_keep_the_elapsed_time(engine, clock):
+    engine.start()
+    clock.advance(10 * 60)
+    engine.set_durations(20 * 60, 5 * 60)
+    assert engine.remaining() == pytest.approx(10 * 60)
+    engine.set_durations(5 * 60, 5 * 60)
+    assert engine.remaining() == 0
+    assert engine.tick() == "work"
@@ -0,0 +1,67 @@
+import pytest
+
+from search_index import SearchIndex, tokenize
+
+
+@pytest.fixture(params=[True, False], ids=["keep_tokens", "no_tokens"])
+def index(request):
+    index = SearchIndex(keep_tokens=request.param)
+    index.add(1, "Project review", "Quarterly numbers", "Work")
+    index.add(2, "Groceries", "milk, eggs", "Personal")
+    index.add(3, "Review code", "pull request", "Development")
+    return index
+
+
+def test_tokenize_lowercases_words():
+    assert tokenize("Project-Review, v2!") == ["project", "review", "v2"]
+    assert tokenize(None) == []
+
+
+def test_every_word_has_to_prefix_a_word(index):
+    assert list(index.search("proj rev")) == [1]
+    assert list(index.search("rev")) == [1, 3]
+    assert list(index.search("REVIEW")) == [1, 3]
+
+
+def test_no_substring_matches(index):
+    assert list(index.search("view")) == []
+
+
+def test_category_is_searched(index):
+    assert list(index.search("personal")) == [2]
+
+
+def test_blank_query_means_no_restriction(index):
+    assert index.search("") is None
+    assert index.search("   ") is None
+
+
+def test_punctuation_only_query_matches_nothing(index):
+    assert index.search("?!") == []
+
+
+def test_remove_drops_the_document(index):
+    index.remove(1, "Project review", "Quarterly numbers", "Work")
+    assert list(index.search("rev")) == [3]
+    assert list(index.search("quarterly")) == []
+    assert len(index) == 2
+
+
+def test_ids_stay_sorted_when_added_out_of_order():
+    index = SearchIndex()
+    for doc_id in (5, 2, 9, 1):
+        index.add(doc_id, "report")
+    assert list(index.search("rep")) == [1, 2, 5, 9]
+
+
+def test_update_replaces_the_text():
+    index = SearchIndex()
+    index.add(1, "Old title")
+    index.update(1, "New title")
+    assert list(index.search("old")) == []
+    assert list(index.search("new")) == [1]
+    assert len(index) == 1
+
+
+def test_cancelled_lookup_stops_early(index):
+    assert index.search("proj rev", cancelled=lambda: True) == []
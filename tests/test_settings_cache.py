@@ -0,0 +1,82 @@
+import pytest
+
+from settings_cache import SettingsCache
+
+
+class FakeSettingsDB:
+    def __init__(self, stored=None, fail=False):
+        self.stored = dict(stored or {})
+        self.fail = fail
+        self.saves = []
+
+    def get_all_settings(self):
+        return dict(self.stored)
+
+    def save_settings(self, settings):
+        self.saves.append(dict(settings))
+        if self.fail:
+            return False
+        self.stored.update(settings)
+        return True
+
+
+@pytest.fixture
+def db():
+    return FakeSettingsDB({'work_duration': '30'})
+
+
+def test_load_overlays_stored_values_on_the_defaults(db):
+    cache = SettingsCache(db, defaults={'work_duration': 25, 'break_duration': 5})
+    assert cache.load()
+    assert cache.get_int('work_duration') == 30
+    assert cache.get_int('break_duration') == 5
+    assert cache.get_int('missing', 7) == 7
+
+
+def test_writes_are_batched_until_flush(db):
+    cache = SettingsCache(db, delay=60)
+    cache.load()
+    assert cache.set('work_duration', 31)
+    assert cache.set('work_duration', 32)
+    assert not cache.set('work_duration', 32)
+    assert cache.get_int('work_duration') == 32
+    assert db.saves == []
+    assert cache.flush()
+    assert db.saves == [{'work_duration': '32'}]
+    assert cache.flush()
+    assert len(db.saves) == 1
+
+
+def test_failed_flush_keeps_the_changes(db):
+    cache = SettingsCache(db, delay=60)
+    cache.set('break_duration', 10)
+    db.fail = True
+    assert not cache.flush()
+    db.fail = False
+    assert cache.close()
+    assert db.stored['break_duration'] == '10'
+
+
+def test_unsaved_changes_win_over_a_reload(db):
+    cache = SettingsCache(db, delay=60)
+    cache.set('work_duration', 45)
+    cache.load()
+    assert cache.get('work_duration') == '45'
+    cache.close()
+
+
+def test_quiet_period_triggers_the_write(db):
+    cache = SettingsCache(db, delay=0.01)
+    cache.set('work_duration', 50)
+    cache._timer.join()
+    assert db.saves == [{'work_duration': '50'}]
+
+
+def test_delayed_write_can_be_handed_to_another_thread(db):
+    submitted = []
+    cache = SettingsCache(db, delay=0.01, submit=submitted.append)
+    cache.set('work_duration', 50)
+    cache._timer.join()
+    assert db.saves == []
+    submitted[0]()
+    assert db.saves == [{'work_duration': '50'}]
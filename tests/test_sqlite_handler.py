@@ -0,0 +1,99 @@
+import pytest
+
+from sqlite_handler import DatabaseHandler
+
+
+def task_data(title, due_date="2024-03-01", priority="Medium", status="Pending"):
+    return (title, "", due_date, None, priority, status, "Work", "None", "")
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseHandler(str(tmp_path / "tasks.db"), commit_interval=60)
+    db.create_tables()
+    yield db
+    db.disconnect()
+
+
+def count_tasks(db):
+    return db.execute_query("SELECT COUNT(*) FROM Tasks", fetch=True)[0][0]
+
+
+def test_add_update_delete(db):
+    task_id = db.add_task(task_data("Write report"))
+    db.update_task(task_id, task_data("Write final report"))
+    assert db.execute_query("SELECT title FROM Tasks WHERE id=?", (task_id,), fetch=True) == [
+        ("Write final report",)]
+    db.delete_task(task_id)
+    assert count_tasks(db) == 0
+
+
+def test_batched_writes_survive_disconnect(tmp_path):
+    path = str(tmp_path / "tasks.db")
+    db = DatabaseHandler(path, commit_interval=60)
+    db.create_tables()
+    db.add_task(task_data("Pending commit"))
+    db.disconnect()
+
+    reopened = DatabaseHandler(path)
+    assert count_tasks(reopened) == 1
+    reopened.disconnect()
+
+
+def test_failing_chunk_is_rolled_back(db):
+    rows = [task_data("a"), task_data("b"), task_data("c"), task_data(None)]
+    assert db.add_tasks(rows, chunk_size=2) is None
+    db.commit()
+    # The first chunk was committed, none of the failing one stays
+    assert count_tasks(db) == 2
+
+
+def test_failed_import_leaves_earlier_batched_writes(db):
+    db.add_task(task_data("Batched"))
+    assert db.add_tasks([task_data(None)]) is None
+    db.commit()
+    assert count_tasks(db) == 1
+
+
+def test_pages_follow_due_date_then_id(db):
+    for title, due_date in (("c", "2024-03-01"), ("none", None), ("a", "2024-01-01"),
+                            ("b", "2024-03-01")):
+        db.add_task(task_data(title, due_date=due_date))
+    pages, after = [], None
+    while True:
+        page = db.get_tasks_page(2, after)
+        if not page:
+            break
+        pages.append([row[1] for row in page])
+        after = page[-1]
+    assert pages == [["none", "a"], ["c", "b"]]
+
+
+def test_iter_tasks_does_not_hold_the_connection(db):
+    db.add_tasks([task_data(f"Task {i}") for i in range(5)])
+    rows = db.iter_tasks(batch_size=2)
+    assert next(rows)[1] == "Task 0"
+    # Other queries still run while the generator is suspended
+    db.add_task(task_data("Task 5"))
+    assert [row[1] for row in rows] == [f"Task {i}" for i in range(1, 6)]
+
+
+def test_stats_are_cached_until_a_write(db):
+    db.add_task(task_data("High", priority="High"))
+    stats = db.get_task_stats()
+    assert stats['total_tasks'] == 1
+    assert db.get_task_stats() is stats
+    db.add_task(task_data("Low", priority="Low"))
+    assert db.get_task_stats()['total_tasks'] == 2
+
+
+def test_settings(db):
+    assert db.save_settings({'work_duration': '30', 'break_duration': '10'})
+    assert db.get_setting('work_duration') == '30'
+    assert db.get_all_settings()['break_duration'] == '10'
+
+
+def test_rowcount(db):
+    task_id = db.add_task(task_data("Task"))
+    assert db.execute_query("DELETE FROM Tasks WHERE id=?", (task_id + 1,), rowcount=True) == 0
+    assert db.execute_query("DELETE FROM Tasks WHERE id=?", (task_id,), rowcount=True) == 1
@@ -0,0 +1,77 @@
+import pytest
+
+from storage import MemoryStorage, SQLiteStorage, TaskRow, TaskStorage, matches_search
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def storage(request, tmp_path):
+    if request.param == "memory":
+        storage = MemoryStorage()
+    else:
+        storage = SQLiteStorage(database=str(tmp_path / "tasks.db"))
+    yield storage
+    storage.close()
+
+
+def add(storage, title, description="", due_date="2024-03-01", priority="Medium",
+        status="Pending", category="Work"):
+    return storage.add(title, description, due_date, priority, status, category)
+
+
+def test_protocol_is_abstract():
+    with pytest.raises(TypeError):
+        TaskStorage()
+
+
+def test_new_storage_is_empty(storage):
+    assert storage.list_tasks() == []
+    assert storage.stats()['total'] == 0
+
+
+def test_crud(storage):
+    task_id = add(storage, "Write report")
+    assert storage.get(task_id) == TaskRow(task_id, "Write report", "", "2024-03-01",
+                                           "Medium", "Pending", "Work")
+    assert storage.update(task_id, "Write report", "", "2024-03-01", "High", "Pending", "Work")
+    # An update that changes nothing still finds the task
+    assert storage.update(task_id, "Write report", "", "2024-03-01", "High", "Pending", "Work")
+    assert storage.get(task_id).priority == "High"
+    assert storage.delete(task_id)
+    assert storage.get(task_id) is None
+
+
+def test_missing_ids_report_false(storage):
+    assert not storage.update(999, "Gone", "", None, "Low", "Pending", "Work")
+    assert not storage.delete(999)
+
+
+def test_filter_and_stats(storage):
+    first = add(storage, "a", priority="High")
+    add(storage, "b", priority="Low", status="Completed")
+    third = add(storage, "c", priority="High", category="Personal")
+    assert [row.id for row in storage.filter(priority="High")] == [first, third]
+    assert [row.id for row in storage.filter(priority="High", category="Work")] == [first]
+    stats = storage.stats()
+    assert stats['total'] == 3
+    assert stats['by_status'] == {'Pending': 2, 'Completed': 1}
+    assert stats['by_priority'] == {'High': 2, 'Low': 1}
+
+
+def test_search_has_the_same_rule_on_every_backend(storage):
+    first = add(storage, "Project review", "quarterly numbers")
+    second = add(storage, "Groceries", "milk", category="Personal")
+    third = add(storage, "Plan 100%_done", "review_notes")
+    assert [row.id for row in storage.search("proj rev")] == [first]
+    assert [row.id for row in storage.search("view")] == []
+    assert [row.id for row in storage.search("personal")] == [second]
+    assert [row.id for row in storage.search("review")] == [first, third]
+    assert [row.id for row in storage.search("100")] == [third]
+    assert [row.id for row in storage.search("")] == [first, second, third]
+    assert [row.id for row in storage.search("  ")] == [first, second, third]
+    assert storage.search("?!") == []
+
+
+def test_matches_search():
+    row = TaskRow(1, "Project review", None, None, "High", "Pending", "Work")
+    assert matches_search(["proj", "wor"], row)
+    assert not matches_search(["view"], row)
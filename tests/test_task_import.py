@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from task_import import TASK_COLUMNS, import_tasks, read_records, to_task_data
+
+
+class FakeDB:
+    def __init__(self):
+        self.rows = []
+
+    def add_tasks(self, rows, chunk_size=1000):
+        rows = list(rows)
+        self.rows.extend(rows)
+        return len(rows)
+
+
+def test_blank_cells_fall_back_to_the_defaults():
+    task = dict(zip(TASK_COLUMNS, to_task_data({'title': ' Report ', 'due_date': ''})))
+    assert task['title'] == "Report"
+    assert task['due_date'] is None
+    assert task['priority'] == "Medium"
+    assert task['status'] == "Pending"
+
+
+def test_missing_title_names_the_record():
+    with pytest.raises(ValueError, match="record 3"):
+        to_task_data({'title': '  '}, 3)
+
+
+def test_reads_csv_json_and_jsonl(tmp_path):
+    (tmp_path / "tasks.csv").write_text("title,priority\nA,High\nB,\n", encoding="utf-8")
+    (tmp_path / "tasks.json").write_text(json.dumps({'tasks': [{'title': "A"}]}), encoding="utf-8")
+    (tmp_path / "tasks.jsonl").write_text('{"title": "A"}\n\n{"title": "B"}\n', encoding="utf-8")
+    assert [r['title'] for r in read_records(str(tmp_path / "tasks.csv"))] == ["A", "B"]
+    assert [r['title'] for r in read_records(str(tmp_path / "tasks.json"))] == ["A"]
+    assert [r['title'] for r in read_records(str(tmp_path / "tasks.jsonl"))] == ["A", "B"]
+    with pytest.raises(ValueError, match="Unsupported"):
+        list(read_records(str(tmp_path / "tasks.txt")))
+
+
+def test_import_inserts_every_record(tmp_path):
+    path = tmp_path / "tasks.csv"
+    path.write_text("title,priority\nA,High\nB,Low\n", encoding="utf-8")
+    db = FakeDB()
+    assert import_tasks(db, str(path)) == 2
+    assert [row[0] for row in db.rows] == ["A", "B"]
+
+
+def test_invalid_record_imports_nothing(tmp_path):
+    path = tmp_path / "tasks.jsonl"
+    path.write_text('{"title": "A"}\n{"priority": "High"}\n', encoding="utf-8")
+    db = FakeDB()
+    with pytest.raises(ValueError, match="record 2"):
+        import_tasks(db, str(path))
+    assert db.rows == []
+
+
+def test_import_into_sqlite(tmp_path):
+    from sqlite_handler import DatabaseHandler
+
+    path = tmp_path / "tasks.json"
+    path.write_text(json.dumps([{'title': f"Task {i}"} for i in range(5)]), encoding="utf-8")
+    db = DatabaseHandler(str(tmp_path / "tasks.db"))
+    db.create_tables()
+    try:
+        assert import_tasks(db, str(path), chunk_size=2) == 5
+        assert db.execute_query("SELECT COUNT(*) FROM Tasks", fetch=True) == [(5,)]
+    finally:
+        db.disconnect()
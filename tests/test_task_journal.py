@@ -0,0 +1,62 @@
+import os
+
+from task_journal import (COMPACTING_FILE, JOURNAL_FILE, TaskJournal, read_journal,
+                          read_snapshot, write_snapshot)
+
+
+def test_snapshot_round_trip(tmp_path):
+    assert read_snapshot(str(tmp_path)) is None
+    rows = [(1, "Title", "2024-01-01"), (2, "Other", "")]
+    write_snapshot(str(tmp_path), 3, {'work_duration': '25'}, rows)
+    assert read_snapshot(str(tmp_path)) == (3, {'work_duration': '25'}, rows)
+
+
+def test_journal_records_are_read_back_in_order(tmp_path):
+    journal = TaskJournal(str(tmp_path), fsync_interval=60)
+    journal.append(("a", 1, ("Title",)))
+    journal.append(("d", 1))
+    journal.close()
+    assert read_journal(os.path.join(tmp_path, JOURNAL_FILE)) == [("a", 1, ("Title",)), ("d", 1)]
+
+
+def test_torn_tail_is_dropped_and_truncated(tmp_path):
+    journal = TaskJournal(str(tmp_path), fsync_interval=60)
+    journal.append(("a", 1, ("Title",)))
+    journal.append(("a", 2, ("Second",)))
+    journal.close()
+    path = os.path.join(tmp_path, JOURNAL_FILE)
+    size = os.path.getsize(path)
+    with open(path, "r+b") as f:
+        f.truncate(size - 3)
+
+    assert read_journal(path) == [("a", 1, ("Title",))]
+    # Appends after recovery follow the last good record
+    journal = TaskJournal(str(tmp_path), fsync_interval=60)
+    journal.append(("d", 1))
+    journal.close()
+    assert read_journal(path) == [("a", 1, ("Title",)), ("d", 1)]
+
+
+def test_corrupt_record_ends_the_journal(tmp_path):
+    journal = TaskJournal(str(tmp_path), fsync_interval=60)
+    journal.append(("a", 1, ("Title",)))
+    journal.append(("a", 2, ("Second",)))
+    journal.close()
+    path = os.path.join(tmp_path, JOURNAL_FILE)
+    with open(path, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        f.write(b"\xff")
+    assert read_journal(path) == [("a", 1, ("Title",))]
+
+
+def test_rotate_appends_to_a_journal_still_waiting_for_its_snapshot(tmp_path):
+    journal = TaskJournal(str(tmp_path), fsync_interval=60)
+    journal.append(("d", 1))
+    journal.rotate()
+    journal.append(("d", 2))
+    journal.rotate()
+    assert journal.records == 0
+    assert read_journal(os.path.join(tmp_path, COMPACTING_FILE)) == [("d", 1), ("d", 2)]
+    journal.compacted()
+    journal.close()
+    assert not os.path.exists(os.path.join(tmp_path, COMPACTING_FILE))
@@ -0,0 +1,259 @@
+import threading
+
+import pytest
+
+import task_store
+from task_store import DatabaseHandler
+
+
+def task_data(title, due_date="2024-03-01", priority="Medium", category="Work",
+              status="Pending", description=""):
+    return (title, due_date, priority, category, status.lower(), status,
+            description, "", due_date)
+
+
+@pytest.fixture
+def db():
+    return DatabaseHandler(demo_tasks=False)
+
+
+def test_crud(db):
+    task_id = db.add_task(task_data("Write report"))
+    assert db.get_task_by_id(task_id).title == "Write report"
+    assert db.update_task(task_id, task_data("Write final report", status="Completed"))
+    assert db.get_task_by_id(task_id).status == "Completed"
+    assert db.delete_task(task_id)
+    assert db.get_task_by_id(task_id) is None
+    assert not db.update_task(task_id, task_data("Gone"))
+    assert not db.delete_task(task_id)
+
+
+def test_get_tasks_keeps_insertion_order_across_updates(db):
+    ids = [db.add_task(task_data(title)) for title in ("a", "b", "c")]
+    db.update_task(ids[0], task_data("a2"))
+    assert [task.title for task in db.get_tasks()] == ["a2", "b", "c"]
+
+
+def test_tasks_are_immutable_rows(db):
+    task_id = db.add_task(task_data("Write report", priority="High"))
+    task = db.get_task_by_id(task_id)
+    assert task[0] == task_id and task[1] == "Write report" and task[3] == "High"
+    assert task.priority == "High"
+    with pytest.raises(AttributeError):
+        task.title = "Changed"
+    # The shared view is reused until the next change
+    assert db.get_tasks() is db.get_tasks()
+    tasks = db.get_tasks()
+    db.update_task(task_id, task_data("Changed"))
+    assert tasks[-1].title == "Write report"
+    assert db.get_tasks()[-1].title == "Changed"
+
+
+def test_query_intersects_the_indexes(db):
+    first = db.add_task(task_data("Project review", priority="High"))
+    db.add_task(task_data("Project plan", priority="Low"))
+    third = db.add_task(task_data("Review code", priority="High", category="Development"))
+    assert [task.id for task in db.query_tasks(priority="High")] == [first, third]
+    assert [task.id for task in db.query_tasks(priority="High", category="Work")] == [first]
+    assert db.query_tasks(priority="High", category="Personal") == []
+    assert db.query_tasks(priority="Urgent") == []
+
+
+def test_indexes_follow_updates_and_deletes(db):
+    task_id = db.add_task(task_data("Task", priority="High"))
+    db.update_task(task_id, task_data("Task", priority="Low"))
+    assert db.query_tasks(priority="High") == []
+    assert [task.id for task in db.query_tasks(priority="Low")] == [task_id]
+    db.delete_task(task_id)
+    assert db.query_tasks(priority="Low") == []
+
+
+def test_due_date_filters(db):
+    early = db.add_task(task_data("Early", due_date="2024-01-10"))
+    db.add_task(task_data("Later", due_date="2024-05-01"))
+    undated = db.add_task(task_data("Undated", due_date=""))
+    assert [task.id for task in db.query_tasks(due_before="2024-02-01")] == [early]
+    assert [task.id for task in db.query_tasks(due_on="2024-01-10")] == [early]
+    assert undated not in [task.id for task in db.query_tasks(due_before="2099-01-01")]
+
+
+def test_search_matches_word_prefixes(db):
+    first = db.add_task(task_data("Project review"))
+    db.add_task(task_data("Project plan", priority="Low"))
+    third = db.add_task(task_data("Review code", priority="High", category="Development"))
+    assert [task.id for task in db.search_tasks("proj rev")] == [first]
+    assert [task.id for task in db.search_tasks("develop")] == [third]
+    assert [task.id for task in db.query_tasks(priority="High", search="rev")] == [third]
+    assert db.search_tasks("view") == []
+    assert db.search_tasks("?!") == []
+
+
+def test_search_follows_edits_and_deletes(db):
+    task_id = db.add_task(task_data("Groceries"))
+    db.update_task(task_id, task_data("Laundry"))
+    assert db.search_tasks("groc") == []
+    assert [task.id for task in db.search_tasks("laun")] == [task_id]
+    db.delete_task(task_id)
+    assert db.search_tasks("laun") == []
+
+
+def test_cancelled_query_returns_none(db):
+    for i in range(3):
+        db.add_task(task_data(f"Task {i}", priority="High"))
+    assert db.query_tasks(priority="High", status="Pending", cancelled=lambda: True) is None
+    assert db.query_tasks(search="task", cancelled=lambda: True) is None
+    assert db.query_tasks(due_before="2099-01-01", cancelled=lambda: True) is None
+
+
+def test_get_tasks_never_returns_none_under_concurrent_writes(db):
+    stop = threading.Event()
+
+    def write():
+        while not stop.is_set():
+            db.update_task(task_id, task_data("Task"))
+
+    task_id = db.add_task(task_data("Task"))
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        for _ in range(2000):
+            assert db.get_tasks() is not None
+    finally:
+        stop.set()
+        writer.join()
+
+
+def test_stats_track_mutations(db):
+    task_id = db.add_task(task_data("Old", due_date="2000-01-01", priority="High"))
+    db.add_task(task_data("Done", due_date="2000-01-01", status="Completed"))
+    stats = db.get_stats()
+    assert stats['total'] == 2
+    assert stats['by_priority']['High'] == 1
+    assert stats['by_status'] == {'Pending': 1, 'Completed': 1}
+    assert stats['overdue'] == 1
+    db.update_task(task_id, task_data("Old", due_date="2000-01-01", status="Completed"))
+    assert db.get_stats()['overdue'] == 0
+    db.delete_task(task_id)
+    assert db.get_stats()['total'] == 1
+
+
+def test_pages_follow_due_date_then_id(db):
+    for title, due_date in (("c", "2024-03-01"), ("none", ""), ("a", "2024-01-01"),
+                            ("b", "2024-03-01"), ("d", "2024-02-01")):
+        db.add_task(task_data(title, due_date=due_date))
+    pages, after = [], None
+    while True:
+        page = db.get_tasks_page(2, after)
+        if not page:
+            break
+        pages.append([task.title for task in page])
+        after = page[-1]
+    assert pages == [["none", "a"], ["d", "c"], ["b"]]
+
+
+def test_iter_tasks_lists_every_task(db):
+    ids = [db.add_task(task_data(f"Task {i}")) for i in range(5)]
+    assert [task.id for task in db.iter_tasks(batch_size=2)] == ids
+
+
+def test_store_is_recovered_from_its_data_dir(tmp_path):
+    db = DatabaseHandler(data_dir=str(tmp_path))
+    task_id = db.add_task(task_data("Persisted"))
+    db.delete_task(1)
+    db.update_setting('work_duration', '40')
+    db.close()
+
+    recovered = DatabaseHandler(data_dir=str(tmp_path))
+    assert recovered.get_task_by_id(task_id).title == "Persisted"
+    assert recovered.get_task_by_id(1) is None
+    assert recovered.get_setting('work_duration') == '40'
+    assert [task.id for task in recovered.search_tasks("persist")] == [task_id]
+    assert recovered.add_task(task_data("Next")) == task_id + 1
+    recovered.close()
+
+
+def test_journal_is_replayed_without_a_close(tmp_path):
+    db = DatabaseHandler(data_dir=str(tmp_path))
+    task_id = db.add_task(task_data("Unsnapshotted"))
+    db._journal.sync()
+
+    recovered = DatabaseHandler(data_dir=str(tmp_path))
+    assert recovered.get_task_by_id(task_id).title == "Unsnapshotted"
+    recovered.close()
+    db.close()
+
+
+def test_failed_journal_write_leaves_the_store_unchanged(tmp_path):
+    db = DatabaseHandler(data_dir=str(tmp_path), demo_tasks=False)
+    task_id = db.add_task(task_data("Kept"))
+    journal = db._journal
+    journal.close()
+
+    assert db.add_task(task_data("Lost")) is False
+    assert not db.update_task(task_id, task_data("Changed"))
+    assert not db.delete_task(task_id)
+    assert [task.title for task in db.get_tasks()] == ["Kept"]
+    assert db.search_tasks("changed") == []
+    assert db.next_id == task_id + 1
+    db._journal = None
+
+
+def test_indexes_are_built_after_recovery_without_losing_changes(tmp_path, monkeypatch):
+    db = DatabaseHandler(data_dir=str(tmp_path), demo_tasks=False)
+    for i in range(60):
+        db.add_task(task_data(f"Task {i} word{i % 7}", due_date=f"2024-01-{i % 28 + 1:02d}",
+                              priority=("High", "Low")[i % 2]))
+    db.close()
+
+    # Hold both build phases until changes have been made meanwhile
+    values_gate, search_gate = threading.Event(), threading.Event()
+    bulk_indexes = task_store._bulk_indexes
+    monkeypatch.setattr(task_store, "_bulk_indexes",
+                        lambda tasks: values_gate.wait() and bulk_indexes(tasks))
+
+    class GatedSearchIndex(task_store.SearchIndex):
+        def add(self, *args):
+            search_gate.wait()
+            super().add(*args)
+
+    monkeypatch.setattr(task_store, "SearchIndex", GatedSearchIndex)
+    db = DatabaseHandler(data_dir=str(tmp_path))
+
+    def change(step):
+        db.update_task(step + 1, task_data(f"Moved {step}", due_date="2023-12-31",
+                                           status="Completed"))
+        db.delete_task(step + 20)
+        db.add_task(task_data(f"New {step}", due_date="", priority="Medium"))
+
+    change(0)
+    values_gate.set()
+    assert db.get_stats()['total'] == 60
+    change(1)
+    search_gate.set()
+    assert [task.title for task in db.search_tasks("moved")] == ["Moved 0", "Moved 1"]
+    change(2)
+
+    reference = DatabaseHandler(demo_tasks=False)
+    for task in db.get_tasks():
+        reference.tasks[task.id] = task
+        reference._index(task)
+    assert db.get_stats() == reference.get_stats()
+    assert list(db._by_due) == list(reference._by_due)
+    assert db._by_priority == reference._by_priority
+    for query in ("task", "word3", "moved", "new"):
+        assert db.search_tasks(query) == reference.search_tasks(query)
+    db.close()
+
+
+def test_cancelled_query_stops_waiting_for_the_build(tmp_path, monkeypatch):
+    db = DatabaseHandler(data_dir=str(tmp_path))
+    db.close()
+    gate = threading.Event()
+    bulk_indexes = task_store._bulk_indexes
+    monkeypatch.setattr(task_store, "_bulk_indexes",
+                        lambda tasks: gate.wait() and bulk_indexes(tasks))
+    db = DatabaseHandler(data_dir=str(tmp_path))
+    assert db.query_tasks(search="project", cancelled=lambda: True) is None
+    gate.set()
+    assert [task.id for task in db.query_tasks(search="project")] == [1]
+    db.close()